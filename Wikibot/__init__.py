@@ -1 +1,2 @@
-from engine import *
\ No newline at end of file
+# The GUI (app, engine and graph) needs pygame, moderngl and a display, so nothing is imported here: the search
+# library in Wikibot.wikiapi and the headless Wikibot.cli load without them
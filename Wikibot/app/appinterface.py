@@ -172,6 +172,9 @@ class AppInterface(ABC):
     @abstractmethod
     def generate_api(self) -> None: pass
 
+    @abstractmethod
+    def process_search_events(self, time_budget: float) -> None: pass
+
     @abstractmethod
     def get_source(self) -> Optional[str]: pass
 
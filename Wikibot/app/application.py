@@ -1,12 +1,15 @@
 import logging
+import time
 import pygame as pg
 from dataclasses import dataclass
 from .appinterface import AppInterface
 from .mainloop import MainLoop
+from .searchworker import SearchWorker
 from Wikibot.engine.graphics import Graphics
 from Wikibot.graph.graph import Graph
 import random
 from typing import Optional
+from Wikibot.wikiapi.events import EXPANDED, FINISHED, STATS, SearchEvent
 from Wikibot.wikiapi.wikiAPI_functions import WikiApi
 
 
@@ -23,6 +26,7 @@ class Application(AppInterface):
     mainloop: MainLoop
     graph: Graph
     wikiapi: Optional[WikiApi]
+    search_worker: Optional[SearchWorker]
     running: bool
     appClock: pg.time.Clock
 
@@ -37,6 +41,7 @@ class Application(AppInterface):
         self.appClock = pg.time.Clock()
         self.graph = Graph(self, "main_menu")
         self.wikiapi = None
+        self.search_worker = None
 
     def add_key_down_binding(self, trigger, drawable) -> None:
         self.mainloop.add_kd_binding(trigger, drawable)
@@ -217,12 +222,40 @@ class Application(AppInterface):
         unique_word_weighting = self.get_word_weighting_mode()
         algorithm_is_bfs = self.get_search_algorithm()
         if source_article is None or target_article is None or search_breadth is None: return
-        self.wikiapi = WikiApi(source_article, target_article, unique_word_weighting, search_breadth, algorithm_is_bfs)
-        self.wikiapi.search()
+        # The search runs on a worker thread, the graph grows as its events come in
+        self.search_worker = SearchWorker(lambda: WikiApi(source_article, target_article, unique_word_weighting,
+                                                          search_breadth, algorithm_is_bfs))
+        self.graph.add_source_node(source_article)
+        self.graph.add_target_node(target_article)
+        self.search_worker.start()
+
+    def process_search_events(self, time_budget: float) -> None:
+        if self.search_worker is None: return
+        deadline = time.monotonic() + time_budget
+        while time.monotonic() < deadline:
+            event = self.search_worker.next_event()
+            if event is None: return
+            self.handle_search_event(event)
+            if self.search_worker is None: return
+
+    def handle_search_event(self, event: SearchEvent) -> None:
+        if event.kind == EXPANDED:
+            self.graph.add_visited_page(event.page, event.parent, event.backward)
+        elif event.kind == STATS:
+            self.mainloop.set_visited_pages_display_text(event.pages_visited)
+        elif event.kind == FINISHED:
+            self.wikiapi = self.search_worker.wikiapi
+            self.search_worker = None
+            self.finish_search(event)
+
+    def finish_search(self, event: SearchEvent) -> None:
+        if self.wikiapi is None or event.result is None:
+            print("\nSearch failed")
+            return
         adjacency_list: dict[str, list[str]] = self.wikiapi.get_adjacency_list()
         proper_source_title = self.wikiapi.get_source_page_title()
         proper_target_title = self.wikiapi.get_target_page_title()
-        self.construct_graph_from_adjacency_list(proper_source_title, proper_target_title, adjacency_list)
+        self.graph.extend_from_adjacency_list(adjacency_list)
         path_length: Optional[int] = self.wikiapi.get_length_of_path()
         if path_length is not None:
             self.mainloop.set_path_length_display_text(path_length)
@@ -261,6 +294,10 @@ class Application(AppInterface):
         self.mainloop.remove_sprite_from_stage(sprite, stage)
 
     def reset(self) -> None:
+        # Abort a search still running, its remaining events are dropped with the worker
+        if self.search_worker is not None:
+            self.search_worker.cancel()
+            self.search_worker = None
         self.wikiapi = None
         self.graph.clear()
         self.mainloop.reset()
@@ -37,6 +37,8 @@ class MainLoop:
         self.FPS = compute_fps
         self.debug = debug
         self.stages = dict()
+        # Seconds of each frame spent turning search events into graph nodes
+        self.search_event_budget = 0.25 / compute_fps
 
     def initialize_stages(self) -> None:
         # Generate stages and load main menu
@@ -136,6 +138,7 @@ class MainLoop:
         # Main overarching code for app loop
         self.do_collisions()
         self.check_app_updates()
+        self.app.process_search_events(self.search_event_budget)
         self.app.graphics.render_frame()
 
     def add_kd_binding(self, trigger, drawable) -> None:
@@ -0,0 +1,52 @@
+import logging
+import queue
+import threading
+from typing import Callable, Optional
+from Wikibot.wikiapi.events import FINISHED, SearchEvent
+from Wikibot.wikiapi.wikiAPI_functions import WikiApi
+
+
+# Runs a search on a background thread so the window keeps drawing frames and handling input while it goes. Search
+# events are posted to a queue that the main loop drains a few at a time every frame
+class SearchWorker:
+    wikiapi: Optional[WikiApi]
+
+    def __init__(self, create_api: Callable[[], WikiApi]):
+        # Building the WikiApi already fetches the target page, so that happens on the worker thread too
+        self.create_api = create_api
+        self.wikiapi = None
+        self.events: queue.Queue = queue.Queue()
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="wikibot-search", daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def run(self) -> None:
+        try:
+            self.wikiapi = self.create_api()
+            if self.cancelled.is_set():
+                return
+            search_events = self.wikiapi.iter_search()
+            try:
+                for event in search_events:
+                    if self.cancelled.is_set():
+                        return
+                    self.events.put(event)
+            finally:
+                # Stops the search where it is when cancelled
+                search_events.close()
+        except Exception:
+            logging.exception("Search failed")
+            self.events.put(SearchEvent(FINISHED))
+
+    # Asks the search to stop, it does so before its next event
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    # Returns the next event posted by the search, None if there is none yet
+    def next_event(self) -> Optional[SearchEvent]:
+        try:
+            return self.events.get_nowait()
+        except queue.Empty:
+            return None
@@ -0,0 +1,71 @@
+# Headless command line interface. Only the wikiapi package is loaded, never pygame or moderngl, so it starts quickly
+# and runs on servers without a display:
+#   python -m Wikibot.cli search "Starbucks" "Strawberry" [--mode astar] [--deadline 10] [--json]
+#   python -m Wikibot.cli search "Starbucks" "Strawberry" --mode exact --graph graph_dir
+#   python -m Wikibot.cli batch pairs.jsonl -o results.jsonl [--workers 8]
+import argparse
+import dataclasses
+import json
+import sys
+from .wikiapi.batch import add_batch_arguments, run_batch
+from .wikiapi.scorers import SCORERS, create_scorer
+from .wikiapi.wikiAPI_functions import WikiApi, find_path
+
+
+def run_search(args) -> int:
+    options = {"search_mode": args.mode, "neighbors_checked": args.breadth,
+               "word_uniqueness": not args.no_uniqueness, "verbose": args.verbose,
+               "scorer": create_scorer(args.scorer, args.df_table)}
+    if args.store:
+        from .wikiapi.pagestore import LocalPageStore
+        options["page_source"] = LocalPageStore(args.store)
+    if args.graph:
+        from .wikiapi.csrgraph import CSRGraph
+        options["page_source"] = CSRGraph(args.graph)
+    result = find_path(args.source, args.target, args.deadline, args.max_pages, args.max_requests, **options)
+    if args.json:
+        print(json.dumps(dataclasses.asdict(result)))
+    else:
+        print(result.message)
+        if result.path is not None:
+            # A partial path ends at the most promising page reached instead of the target
+            print(" --> ".join(result.path) + ("" if result.found else " --> ..."))
+        print(f"Path length = {len(result.path) - 1 if result.found else 'none'}, "
+              f"Number of visited sites = {result.pages_visited}, Requests = {result.requests_issued}, "
+              f"Time = {result.elapsed:.2f}s")
+    return 0 if result.found else 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m Wikibot.cli", description="Find paths between Wikipedia pages")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search_parser = commands.add_parser("search", help="find a path from one page to another")
+    search_parser.add_argument("source", help="title of the starting page")
+    search_parser.add_argument("target", help="title of the page to reach")
+    search_parser.add_argument("--mode", choices=WikiApi.SEARCH_MODES, default="greedy", help="search algorithm")
+    search_parser.add_argument("--breadth", type=int, default=5, help="best links kept from each page")
+    search_parser.add_argument("--scorer", choices=SCORERS, default="relation", help="how links are ranked")
+    search_parser.add_argument("--df-table", help="document frequency table for the bm25 scorer")
+    search_parser.add_argument("--no-uniqueness", action="store_true", help="do not weight words by how rare they are")
+    search_parser.add_argument("--store", help="local SQLite page store to search instead of Wikipedia")
+    search_parser.add_argument("--graph", help="CSR link graph directory to search instead of Wikipedia")
+    search_parser.add_argument("--deadline", type=float, help="seconds the search may take")
+    search_parser.add_argument("--max-pages", type=int, help="pages the search may visit")
+    search_parser.add_argument("--max-requests", type=int, help="page source requests the search may make")
+    search_parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    search_parser.add_argument("--verbose", action="store_true", help="print every page as it is expanded")
+    search_parser.set_defaults(run=run_search)
+
+    batch_parser = commands.add_parser("batch", help="solve many source/target pairs concurrently")
+    add_batch_arguments(batch_parser)
+    batch_parser.set_defaults(run=lambda args: run_batch(args) or 0)
+
+    args = parser.parse_args(argv)
+    if args.scorer == "bm25" and args.df_table is None:
+        parser.error("--scorer bm25 needs --df-table")
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
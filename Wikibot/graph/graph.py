@@ -316,6 +316,34 @@ class Graph(GraphType):
                 else:
                     self.add_node_with_in_link(title, link)
 
+    def add_visited_page(self, title: str, parent: str, backward: bool = False):
+        # Pages reached backwards from the target link to their parent instead of from it
+        if title not in self.nodes.keys():
+            if parent in self.nodes.keys() and not backward:
+                self.add_node_with_in_link(parent, title)
+                return
+            self.add_node(title)
+        if parent in self.nodes.keys():
+            if backward:
+                self.add_missing_link(title, parent)
+            else:
+                self.add_missing_link(parent, title)
+
+    def add_missing_link(self, source_node, target_node):
+        if self.nodes[target_node] not in self.nodes[source_node].out_links:
+            self.add_link(source_node, target_node)
+
+    def extend_from_adjacency_list(self, adjacency_list: dict[str, list[str]]):
+        # Adds whatever nodes and links of the adjacency list are not drawn yet
+        for title, outlinks in adjacency_list.items():
+            if not title in self.nodes.keys():
+                self.add_node(title)
+            for link in outlinks:
+                if link in self.nodes.keys():
+                    self.add_missing_link(title, link)
+                else:
+                    self.add_node_with_in_link(title, link)
+
     def highlight_path(self, path: Optional[list[str]]):
         for i, title in enumerate(path[:-1]):
             self.nodes[title].set_color("green")
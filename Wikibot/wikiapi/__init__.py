@@ -0,0 +1,13 @@
+# Search library behind the GUI and the command line. Imports nothing from the GUI packages, so it runs headless
+from .batch import BatchSolver, read_pairs
+from .budget import SearchBudget, SearchResult
+from .csrgraph import CSRGraph
+from .events import SearchEvent
+from .pagecache import PageCache, get_shared_page_cache, set_shared_page_cache
+from .pagesource import DictPageSource, PageSource, WikipediaPageSource
+from .pagestore import LocalPageStore
+from .resolver import TitleResolver
+from .scorers import BM25Scorer, DocumentFrequencyTable, LinkScorer, RelationScorer
+from .targetprofile import TargetProfile, TargetProfileCache, get_shared_profile_cache
+from .titles import normalize_title, title_key
+from .wikiAPI_functions import WikiApi, find_path
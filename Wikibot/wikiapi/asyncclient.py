@@ -0,0 +1,79 @@
+# Asyncio MediaWiki client used by the level synchronous BFS. All requests share one pooled HTTP session, the number
+# in flight is capped and a token bucket keeps the request rate within Wikipedia API etiquette. Point api_url at a
+# local stand-in server to exercise it without touching Wikipedia
+import asyncio
+import time
+from typing import Optional
+import aiohttp
+
+DEFAULT_API_URL = "https://en.wikipedia.org/w/api.php"
+
+
+# Allows bursts of up to capacity requests, refilled at rate requests per second
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    # Waits until a token is available and takes it
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncMediaWikiClient:
+    def __init__(self, api_url=DEFAULT_API_URL, user_agent='DSA_Project3', concurrency=8, requests_per_second=10.0):
+        self.api_url = api_url
+        self.user_agent = user_agent
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(requests_per_second) if requests_per_second else None
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.session: Optional[aiohttp.ClientSession] = None
+        # Number of HTTP requests issued, continuations included
+        self.requests = 0
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        self.session = aiohttp.ClientSession(connector=connector, headers={"User-Agent": self.user_agent})
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+        self.session = None
+
+    # Sends one API query and returns the decoded JSON response
+    async def query(self, params: dict) -> dict:
+        async with self.semaphore:
+            if self.bucket is not None:
+                await self.bucket.acquire()
+            self.requests += 1
+            async with self.session.get(self.api_url, params=params) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+    # Returns list of page titles that given page points to, or None if the page does not exist. A redirect title gets
+    # the links of the article it leads to, the same as in the other page sources
+    async def get_links(self, page_title) -> Optional[list[str]]:
+        params = {"action": "query", "format": "json", "formatversion": "2", "prop": "links", "redirects": "1",
+                  "titles": page_title, "pllimit": "max"}
+        links = []
+        while True:
+            data = await self.query(params)
+            pages = data.get("query", {}).get("pages", [])
+            if not pages or pages[0].get("missing") or pages[0].get("invalid"):
+                return None
+            links.extend(link["title"] for link in pages[0].get("links", []))
+            # Long link lists come back in several parts
+            if "continue" not in data:
+                return links
+            params = {**params, **data["continue"]}
@@ -0,0 +1,158 @@
+# Solves many (source, target) pairs concurrently. Every search shares one page source (and so one HTTP connection
+# pool), one page cache and one target profile cache, so pairs with a common target or overlapping neighbourhoods
+# reuse each other's work. Results stream out as JSON lines with per-query timings, followed by a throughput report:
+#   python -m Wikibot.wikiapi.batch pairs.jsonl [-o results.jsonl] [--workers 8] [--mode greedy] [--deadline 30]
+# Pairs are read from JSONL ({"source": ..., "target": ...} with an optional "id") or CSV with source and target columns
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, Optional
+from .pagecache import PageCache, get_shared_page_cache
+from .pagesource import PageSource, WikipediaPageSource
+from .scorers import SCORERS, create_scorer
+from .targetprofile import TargetProfileCache, get_shared_profile_cache
+from .wikiAPI_functions import WikiApi
+
+
+# Returns the (id, source, target) pairs of a JSONL or CSV file, numbering pairs that have no id
+def read_pairs(path) -> list[tuple[str, str, str]]:
+    pairs = []
+    with open(path, newline="", encoding="utf-8") as pairs_file:
+        if path.endswith(".csv"):
+            rows = csv.DictReader(pairs_file)
+        else:
+            rows = (json.loads(line) for line in pairs_file if line.strip())
+        for number, row in enumerate(rows):
+            pairs.append((str(row.get("id", number)), row["source"], row["target"]))
+    return pairs
+
+
+class BatchSolver:
+    def __init__(self, page_source: Optional[PageSource] = None, page_cache: Optional[PageCache] = None,
+                 profile_cache: Optional[TargetProfileCache] = None, workers=8, deadline: Optional[float] = None,
+                 max_pages: Optional[int] = None, max_requests: Optional[int] = None, **search_options):
+        self.workers = workers
+        # One connection per worker is kept alive in the shared pool
+        self.page_source = page_source if page_source is not None else WikipediaPageSource(pool_size=workers)
+        self.page_cache = (page_cache if page_cache is not None
+                           else get_shared_page_cache(self.page_source.persistent_cache))
+        self.profile_cache = profile_cache if profile_cache is not None else get_shared_profile_cache()
+        # Limits applied to every search, see WikiApi.search
+        self.deadline = deadline
+        self.max_pages = max_pages
+        self.max_requests = max_requests
+        # Any other WikiApi keyword argument, e.g. search_mode or neighbors_checked
+        self.search_options = search_options
+        # Totals of the last solve() for the throughput report
+        self.queries = 0
+        self.found = 0
+        self.failed = 0
+        self.requests = 0
+        self.elapsed = 0.0
+        self.cache_stats_before = {}
+        self.profile_hits_before = 0
+        self.profile_misses_before = 0
+
+    # Solves one pair and returns its result record
+    def solve_one(self, query_id, source, target) -> dict:
+        start = time.perf_counter()
+        record = {"id": query_id, "source": source, "target": target}
+        try:
+            wiki = WikiApi(source, target, page_source=self.page_source, page_cache=self.page_cache,
+                           profile_cache=self.profile_cache, verbose=False, **self.search_options)
+            setup_time = time.perf_counter() - start
+            result = wiki.search(self.deadline, self.max_pages, self.max_requests)
+            record.update(found=result.found, partial=result.partial, path=result.path,
+                          path_length=len(result.path) - 1 if result.found else None,
+                          stop_reason=result.stop_reason, pages_visited=result.pages_visited,
+                          requests=result.requests_issued, setup_seconds=round(setup_time, 4),
+                          search_seconds=round(result.elapsed, 4))
+        except Exception as e:
+            record.update(found=False, error=f"{type(e).__name__}: {e}")
+        record["seconds"] = round(time.perf_counter() - start, 4)
+        return record
+
+    # Solves every pair on the worker pool, yielding result records in the order they finish
+    def solve(self, pairs: Iterable[tuple[str, str, str]]) -> Iterator[dict]:
+        self.queries = self.found = self.failed = self.requests = 0
+        self.cache_stats_before = self.page_cache.get_stats()
+        self.profile_hits_before = self.profile_cache.hits
+        self.profile_misses_before = self.profile_cache.misses
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="wikibot-batch") as executor:
+            futures = [executor.submit(self.solve_one, *pair) for pair in pairs]
+            for future in as_completed(futures):
+                record = future.result()
+                self.queries += 1
+                self.found += bool(record.get("found"))
+                self.failed += "error" in record
+                self.requests += record.get("requests", 0)
+                self.elapsed = time.perf_counter() - start
+                yield record
+
+    # Returns throughput figures for the last solve()
+    def get_report(self) -> dict:
+        stats = self.page_cache.get_stats()
+        hits = (stats["memory_hits"] + stats["disk_hits"]
+                - self.cache_stats_before["memory_hits"] - self.cache_stats_before["disk_hits"])
+        lookups = hits + stats["misses"] - self.cache_stats_before["misses"]
+        profile_hits = self.profile_cache.hits - self.profile_hits_before
+        profile_lookups = profile_hits + self.profile_cache.misses - self.profile_misses_before
+        return {"queries": self.queries, "found": self.found, "failed": self.failed,
+                "seconds": round(self.elapsed, 3),
+                "queries_per_second": round(self.queries / self.elapsed, 3) if self.elapsed else 0.0,
+                "requests_per_query": round(self.requests / self.queries, 3) if self.queries else 0.0,
+                "cache_hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "profile_hit_rate": round(profile_hits / profile_lookups, 4) if profile_lookups else 0.0}
+
+
+# Adds the batch options to an argument parser, shared with the command line interface
+def add_batch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("pairs", help="JSONL or CSV file of source/target pairs")
+    parser.add_argument("-o", "--output", help="JSONL file to write results to (default: standard output)")
+    parser.add_argument("--workers", type=int, default=8, help="searches run at once")
+    parser.add_argument("--mode", choices=WikiApi.SEARCH_MODES, default="greedy", help="search algorithm")
+    parser.add_argument("--breadth", type=int, default=5, help="best links kept from each page")
+    parser.add_argument("--scorer", choices=SCORERS, default="relation", help="how links are ranked")
+    parser.add_argument("--df-table", help="document frequency table for the bm25 scorer")
+    parser.add_argument("--store", help="local SQLite page store to search instead of Wikipedia")
+    parser.add_argument("--graph", help="CSR link graph directory to search instead of Wikipedia")
+    parser.add_argument("--deadline", type=float, help="seconds allowed per search")
+    parser.add_argument("--max-pages", type=int, help="pages each search may visit")
+    parser.add_argument("--max-requests", type=int, help="page source requests each search may make")
+
+
+# Runs a batch from parsed arguments, writing results and then the report (to standard error)
+def run_batch(args) -> None:
+    page_source = None
+    if args.store:
+        from .pagestore import LocalPageStore
+        page_source = LocalPageStore(args.store)
+    if args.graph:
+        from .csrgraph import CSRGraph
+        page_source = CSRGraph(args.graph)
+    solver = BatchSolver(page_source, workers=args.workers, deadline=args.deadline, max_pages=args.max_pages,
+                         max_requests=args.max_requests, search_mode=args.mode, neighbors_checked=args.breadth,
+                         scorer=create_scorer(args.scorer, args.df_table))
+    pairs = read_pairs(args.pairs)
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        # Anything else the searches print goes to standard error so standard output stays valid JSONL
+        with contextlib.redirect_stdout(sys.stderr):
+            for record in solver.solve(pairs):
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(json.dumps(solver.get_report()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(description="Solve many Wikipedia speedrun pairs at once")
+    add_batch_arguments(argument_parser)
+    run_batch(argument_parser.parse_args())
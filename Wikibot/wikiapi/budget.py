@@ -0,0 +1,45 @@
+# Limits on how much work one search may do, and what search() hands back when it stops
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+class SearchBudget:
+    # deadline is in seconds of wall time from the start of the search, any limit left as None is unbounded
+    def __init__(self, deadline: Optional[float] = None, max_pages: Optional[int] = None,
+                 max_requests: Optional[int] = None):
+        self.started = time.monotonic()
+        self.deadline_at = self.started + deadline if deadline is not None else None
+        self.max_pages = max_pages
+        self.max_requests = max_requests
+
+    # Returns the name of the limit that has run out, or None while there is budget left
+    def exhausted(self, pages_visited: int, requests_issued: int) -> Optional[str]:
+        if self.deadline_at is not None and time.monotonic() >= self.deadline_at:
+            return "deadline"
+        if self.max_pages is not None and pages_visited >= self.max_pages:
+            return "max_pages"
+        if self.max_requests is not None and requests_issued >= self.max_requests:
+            return "max_requests"
+        return None
+
+    # Returns seconds since the search started
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+@dataclass()
+class SearchResult:
+    found: bool
+    # Path from the source to the target, or with partial set, to the most promising page reached before the budget
+    # ran out. None if nothing useful was reached
+    path: Optional[list[str]]
+    partial: bool
+    message: str
+    # Which limit stopped the search ("deadline", "max_pages" or "max_requests"), None if it ran to completion
+    stop_reason: Optional[str] = None
+    pages_visited: int = 0
+    requests_issued: int = 0
+    elapsed: float = 0.0
+    # Relation score of the last page of a partial path
+    score: Optional[float] = field(default=None)
@@ -0,0 +1,188 @@
+# Compact on-disk link graph for local dumps with millions of pages. Every page gets an int32 id; its out links are a
+# slice of one neighbors array (compressed sparse rows: the links of page i are neighbors[offsets[i]:offsets[i + 1]])
+# and a second, reversed copy gives the backlinks. The arrays are .npy files opened as memory maps, so only the
+# parts a search touches are read from disk. Build one from a page store or JSONL dump with:
+#   python -m Wikibot.wikiapi.csrgraph graph_dir corpus.db|pages.jsonl
+import json
+import os
+import sys
+from typing import Iterable, Optional
+import numpy as np
+from .pagesource import PageSource
+from .titles import normalize_title
+
+OFFSETS_FILE = "offsets.npy"
+NEIGHBORS_FILE = "neighbors.npy"
+REVERSE_OFFSETS_FILE = "reverse_offsets.npy"
+REVERSE_NEIGHBORS_FILE = "reverse_neighbors.npy"
+# One title per line, line i is the title of page id i
+TITLES_FILE = "titles.txt"
+
+
+class CSRGraph(PageSource):
+    def __init__(self, directory):
+        self.directory = directory
+        self.name = f"csr:{os.path.abspath(directory)}"
+        self.offsets = np.load(os.path.join(directory, OFFSETS_FILE), mmap_mode="r")
+        self.neighbors = np.load(os.path.join(directory, NEIGHBORS_FILE), mmap_mode="r")
+        self.reverse_offsets = np.load(os.path.join(directory, REVERSE_OFFSETS_FILE), mmap_mode="r")
+        self.reverse_neighbors = np.load(os.path.join(directory, REVERSE_NEIGHBORS_FILE), mmap_mode="r")
+        with open(os.path.join(directory, TITLES_FILE), encoding="utf-8") as titles_file:
+            self.titles = titles_file.read().split("\n")[:self.page_count()]
+        # Normalized title -> id, built on first lookup
+        self.ids: Optional[dict[str, int]] = None
+
+    def page_count(self) -> int:
+        return len(self.offsets) - 1
+
+    # Returns the id of a page, None if it is not in the graph
+    def get_id(self, page_title) -> Optional[int]:
+        if self.ids is None:
+            self.ids = {title: page_id for page_id, title in enumerate(self.titles)}
+        return self.ids.get(normalize_title(page_title))
+
+    def get_title(self, page_id) -> str:
+        return self.titles[page_id]
+
+    # Returns the ids a page links to
+    def out_ids(self, page_id) -> np.ndarray:
+        return self.neighbors[self.offsets[page_id]:self.offsets[page_id + 1]]
+
+    # Returns the ids of pages linking to a page
+    def in_ids(self, page_id) -> np.ndarray:
+        return self.reverse_neighbors[self.reverse_offsets[page_id]:self.reverse_offsets[page_id + 1]]
+
+    def get_links(self, page_title) -> Optional[list[str]]:
+        page_id = self.get_id(page_title)
+        if page_id is None:
+            return None
+        return [self.titles[link] for link in self.out_ids(page_id)]
+
+    def get_backlinks(self, page_title) -> Optional[list[str]]:
+        page_id = self.get_id(page_title)
+        if page_id is None:
+            return None
+        return [self.titles[link] for link in self.in_ids(page_id)]
+
+    # The graph only holds links, pages have no text
+    def get_text(self, page_title) -> Optional[str]:
+        return "" if self.get_id(page_title) is not None else None
+
+
+# Returns the (neighbor ids, ids they were reached from) of every link out of a set of pages in one gather
+def expand_frontier(offsets: np.ndarray, neighbors: np.ndarray, frontier: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+    # Position of every link slot: the start of its row plus its place within the row
+    row_shift = starts - (np.cumsum(counts) - counts)
+    slots = np.repeat(row_shift, counts) + np.arange(total)
+    return np.asarray(neighbors[slots]), np.repeat(frontier, counts)
+
+
+# Returns the ids of a shortest path from source_id to target_id, None if there is none. Both sides expand whole
+# levels with the visited sets kept as boolean arrays, always on the side with the smaller frontier. Once a level
+# touches the other side, the meeting page with the shortest total distance gives an optimal path. stop is called
+# before every level and ends the search when it returns True
+def shortest_path_ids(graph: CSRGraph, source_id, target_id, stop=lambda pages_visited: False) -> Optional[list[int]]:
+    if source_id == target_id:
+        return [source_id]
+    page_count = graph.page_count()
+    sides = []
+    for start_id, offsets, neighbors in ((source_id, graph.offsets, graph.neighbors),
+                                         (target_id, graph.reverse_offsets, graph.reverse_neighbors)):
+        visited = np.zeros(page_count, dtype=bool)
+        visited[start_id] = True
+        parents = np.full(page_count, -1, dtype=np.int32)
+        depths = np.full(page_count, -1, dtype=np.int32)
+        depths[start_id] = 0
+        sides.append({"visited": visited, "parents": parents, "depths": depths, "offsets": offsets,
+                      "neighbors": neighbors, "frontier": np.array([start_id], dtype=np.int32)})
+    forward, backward = sides
+    pages_visited = 2
+
+    while len(forward["frontier"]) and len(backward["frontier"]):
+        if stop(pages_visited):
+            return None
+        side, other = (forward, backward) if len(forward["frontier"]) <= len(backward["frontier"]) else (backward, forward)
+        reached, reached_from = expand_frontier(side["offsets"], side["neighbors"], side["frontier"])
+        new = ~side["visited"][reached]
+        # Keep the first page each new page was reached from
+        new_ids, first = np.unique(reached[new], return_index=True)
+        side["visited"][new_ids] = True
+        side["parents"][new_ids] = reached_from[new][first]
+        side["depths"][new_ids] = side["depths"][side["frontier"][0]] + 1
+        side["frontier"] = new_ids.astype(np.int32)
+        pages_visited += len(new_ids)
+
+        meeting = new_ids[other["visited"][new_ids]]
+        if len(meeting):
+            best = meeting[np.argmin(other["depths"][meeting])]
+            path = [int(best)]
+            while forward["parents"][path[0]] != -1:
+                path.insert(0, int(forward["parents"][path[0]]))
+            while backward["parents"][path[-1]] != -1:
+                path.append(int(backward["parents"][path[-1]]))
+            return path
+    return None
+
+
+# Writes the graph files for pages with the given titles and (source id, target id) links
+def write_csr_graph(directory, titles: list[str], sources: np.ndarray, targets: np.ndarray) -> None:
+    os.makedirs(directory, exist_ok=True)
+    page_count = len(titles)
+    for offsets_file, neighbors_file, rows, columns in ((OFFSETS_FILE, NEIGHBORS_FILE, sources, targets),
+                                                        (REVERSE_OFFSETS_FILE, REVERSE_NEIGHBORS_FILE, targets, sources)):
+        order = np.argsort(rows, kind="stable")
+        offsets = np.zeros(page_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=page_count), out=offsets[1:])
+        np.save(os.path.join(directory, offsets_file), offsets)
+        np.save(os.path.join(directory, neighbors_file), columns[order].astype(np.int32))
+    with open(os.path.join(directory, TITLES_FILE), "w", encoding="utf-8") as titles_file:
+        titles_file.write("\n".join(titles))
+
+
+# Builds a graph from (title, links) pairs. Links to titles that are not pages are dropped, as are repeated links
+def build_csr_graph(directory, pages: Iterable[tuple[str, list[str]]]) -> CSRGraph:
+    pages = [(normalize_title(title), links) for title, links in pages]
+    ids = {}
+    for title, _ in pages:
+        ids.setdefault(title, len(ids))
+    sources = []
+    targets = []
+    for title, links in pages:
+        page_id = ids[title]
+        for target_id in dict.fromkeys(ids.get(normalize_title(link)) for link in links):
+            if target_id is not None and target_id != page_id:
+                sources.append(page_id)
+                targets.append(target_id)
+    write_csr_graph(directory, list(ids), np.array(sources, dtype=np.int32), np.array(targets, dtype=np.int32))
+    return CSRGraph(directory)
+
+
+# Reads (title, links) pairs from a LocalPageStore file or a JSONL dump
+def read_pages(path) -> Iterable[tuple[str, list[str]]]:
+    if path.endswith(".db"):
+        from .pagestore import LocalPageStore
+        store = LocalPageStore(path)
+        try:
+            for title in store.get_titles():
+                yield title, store.get_links(title) or []
+        finally:
+            store.close()
+        return
+    with open(path, encoding="utf-8") as pages_file:
+        for line in pages_file:
+            if line.strip():
+                page = json.loads(line)
+                yield page["title"], page.get("links", [])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python -m Wikibot.wikiapi.csrgraph graph_dir corpus.db|pages.jsonl")
+        sys.exit(1)
+    csr_graph = build_csr_graph(sys.argv[1], read_pages(sys.argv[2]))
+    print(f"Wrote {csr_graph.page_count()} pages and {len(csr_graph.neighbors)} links to {sys.argv[1]}")
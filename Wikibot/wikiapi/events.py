@@ -0,0 +1,29 @@
+# Events WikiApi.iter_search() yields while a search runs, so the GUI and command line can show progress as it
+# happens and stop the search early by closing the generator
+from dataclasses import dataclass
+from typing import Optional
+from .budget import SearchResult
+
+# Kinds of event, in the order a search produces them
+EXPANDED = "expanded"   # a page was visited and is about to have its links fetched
+SCORED = "scored"       # the best links of a page were scored, candidates holds them
+FOUND = "found"         # the target was reached, path holds the path to it
+STATS = "stats"         # counters so far, sent every few pages
+FINISHED = "finished"   # the search is over, result holds what search() returns
+
+
+@dataclass()
+class SearchEvent:
+    kind: str
+    page: str = ""
+    parent: str = ""
+    depth: int = 0
+    # True for pages reached backwards from the target by bidirectional search
+    backward: bool = False
+    # Link title -> relation score of a SCORED page
+    candidates: Optional[dict[str, float]] = None
+    path: Optional[list[str]] = None
+    pages_visited: int = 0
+    requests_issued: int = 0
+    elapsed: float = 0.0
+    result: Optional[SearchResult] = None
@@ -0,0 +1,98 @@
+# Priority queue of pages waiting to be expanded, with an optional capacity. Past the capacity it drops the entries
+# that would be popped last, so a long search keeps a frontier of fixed size instead of one that grows with every
+# page expanded. Entries sit in two heaps, one ordered best first for pop() and one worst first for eviction; an
+# entry taken out of one heap is only marked removed in the other and skipped when it reaches the top
+import heapq
+from itertools import islice
+from typing import Any, Iterator, Optional
+
+
+# Yields the entries of a heap smallest first without changing it. Only entries whose parent was already yielded are
+# candidates, so taking the first k costs O(k log k) however large the heap is
+def iter_sorted(heap: list) -> Iterator[Any]:
+    candidates = [(heap[0], 0)] if heap else []
+    while candidates:
+        entry, index = heapq.heappop(candidates)
+        yield entry
+        for child in (2 * index + 1, 2 * index + 2):
+            if child < len(heap):
+                heapq.heappush(candidates, (heap[child], child))
+
+
+class BoundedPriorityQueue:
+    def __init__(self, capacity: Optional[int] = None):
+        # None for no limit
+        self.capacity = capacity
+        # (priority, insertion order, item), smallest priority first, earlier entries first on ties
+        self.best = []
+        # (-priority, -insertion order, item), so the entry popped last is on top
+        self.worst = []
+        # Insertion orders of entries taken out through the other heap
+        self.removed = set()
+        self.pushed = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    # Queues an item and returns the item evicted to stay within capacity (possibly this one), None if none was
+    def push(self, priority, item) -> Optional[Any]:
+        if self.capacity is not None and self.size >= self.capacity:
+            if self.capacity == 0:
+                return item
+            self.drop_removed(self.worst)
+            worst_priority, worst_order, worst_item = self.worst[0]
+            # The new item would be popped after every queued one
+            if (priority, self.pushed) > (-worst_priority, -worst_order):
+                return item
+            heapq.heappop(self.worst)
+            self.removed.add(-worst_order)
+            self.size -= 1
+            evicted = worst_item
+        else:
+            evicted = None
+        heapq.heappush(self.best, (priority, self.pushed, item))
+        heapq.heappush(self.worst, (-priority, -self.pushed, item))
+        self.pushed += 1
+        self.size += 1
+        self.compact()
+        return evicted
+
+    # Removes and returns the (priority, item) that comes first
+    def pop(self) -> tuple[Any, Any]:
+        self.drop_removed(self.best)
+        priority, order, item = heapq.heappop(self.best)
+        self.removed.add(order)
+        self.size -= 1
+        self.compact()
+        return priority, item
+
+    # Returns up to count queued items in the order they would be popped, without removing them
+    def peek(self, count) -> list[Any]:
+        self.drop_removed(self.best)
+        live = (entry for entry in iter_sorted(self.best) if entry[1] not in self.removed)
+        return [item for _, _, item in islice(live, count)]
+
+    # Pops removed entries off the top of a heap
+    def drop_removed(self, heap) -> None:
+        while heap:
+            order = heap[0][1] if heap is self.best else -heap[0][1]
+            if order not in self.removed:
+                return
+            heapq.heappop(heap)
+            # Taken out of both heaps now
+            self.removed.discard(order)
+
+    # Rebuilds both heaps once removed entries outnumber queued ones, so stale entries never hold more memory than
+    # live ones
+    def compact(self) -> None:
+        if len(self.removed) <= self.size:
+            return
+        self.best = [entry for entry in self.best if entry[1] not in self.removed]
+        self.worst = [entry for entry in self.worst if -entry[1] not in self.removed]
+        heapq.heapify(self.best)
+        heapq.heapify(self.worst)
+        self.removed.clear()
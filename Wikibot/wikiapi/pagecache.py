@@ -0,0 +1,187 @@
+# Two tier cache for link lists and page text: an in-process LRU in front of an SQLite file with a time to live and
+# a byte budget. One shared instance is used by every WikiApi so re-running a search does not refetch its pages
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional
+from .titles import normalize_title
+
+_schema = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored REAL NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+# Location of the on-disk tier used by the shared cache
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "wikibot", "page_cache.db")
+
+
+class PageCache:
+    def __init__(self, memory_entries=4096, disk_path: Optional[str] = None,
+                 disk_budget_bytes=256 * 1024 * 1024, ttl_seconds=7 * 24 * 60 * 60):
+        self.memory_entries = memory_entries
+        self.disk_budget_bytes = disk_budget_bytes
+        self.ttl_seconds = ttl_seconds
+        # Maps (kind, normalized title) to (value, time stored), oldest used first
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        # Counters for sizing the cache
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+        self.expirations = 0
+        # On-disk tier, skipped entirely when no path is given
+        self.connection = None
+        self.disk_bytes = 0
+        if disk_path is not None:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(disk_path, check_same_thread=False)
+            self.connection.executescript(_schema)
+            self.disk_bytes = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    # Returns the cached value for a page, or None on a miss. Kind names the source and the data, e.g.
+    # "wikipedia:en/links" or "wikipedia:en/text". Lookups made with count=False (bookkeeping such as canonical titles,
+    # which most sources never store) leave the hit and miss counters alone, so those keep measuring page data
+    def get(self, kind, page_title, count=True):
+        key = (kind, normalize_title(page_title))
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                if now - entry[1] <= self.ttl_seconds:
+                    self.memory.move_to_end(key)
+                    self.memory_hits += count
+                    return entry[0]
+                del self.memory[key]
+                self.expirations += 1
+            entry = self._disk_get(key, now)
+            if entry is None:
+                self.misses += count
+                return None
+            self.disk_hits += count
+            self._memory_put(key, *entry)
+            return entry[0]
+
+    # Stores a value for a page in both tiers
+    def put(self, kind, page_title, value) -> None:
+        key = (kind, normalize_title(page_title))
+        now = time.time()
+        with self.lock:
+            self._memory_put(key, value, now)
+            self._disk_put(key, value, now)
+
+    # Drops every entry from both tiers
+    def clear(self) -> None:
+        with self.lock:
+            self.memory.clear()
+            if self.connection is not None:
+                with self.connection:
+                    self.connection.execute("DELETE FROM entries")
+                self.disk_bytes = 0
+
+    # Returns hit, miss and eviction counters plus current sizes
+    def get_stats(self) -> dict:
+        with self.lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {"memory_hits": self.memory_hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                    "memory_evictions": self.memory_evictions, "disk_evictions": self.disk_evictions,
+                    "expirations": self.expirations, "memory_entries": len(self.memory),
+                    "disk_bytes": self.disk_bytes}
+
+    def close(self) -> None:
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def _memory_put(self, key, value, stored) -> None:
+        self.memory[key] = (value, stored)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+            self.memory_evictions += 1
+
+    def _disk_get(self, key, now):
+        if self.connection is None:
+            return None
+        row = self.connection.execute("SELECT value, size, stored FROM entries WHERE kind = ? AND key = ?",
+                                      key).fetchone()
+        if row is None:
+            return None
+        value, size, stored = row
+        with self.connection:
+            if now - stored > self.ttl_seconds:
+                self.connection.execute("DELETE FROM entries WHERE kind = ? AND key = ?", key)
+                self.disk_bytes -= size
+                self.expirations += 1
+                return None
+            self.connection.execute("UPDATE entries SET accessed = ? WHERE kind = ? AND key = ?", (now, *key))
+        return json.loads(zlib.decompress(value)), stored
+
+    def _disk_put(self, key, value, now) -> None:
+        if self.connection is None:
+            return
+        blob = zlib.compress(json.dumps(value).encode("utf-8"), 1)
+        with self.connection:
+            old = self.connection.execute("SELECT size FROM entries WHERE kind = ? AND key = ?", key).fetchone()
+            if old is not None:
+                self.disk_bytes -= old[0]
+            self.connection.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                                    (*key, blob, len(blob), now, now))
+            self.disk_bytes += len(blob)
+            # Evict least recently used entries until the file is back under budget
+            while self.disk_bytes > self.disk_budget_bytes:
+                rows = self.connection.execute("SELECT kind, key, size FROM entries ORDER BY accessed LIMIT 64")\
+                    .fetchall()
+                if not rows:
+                    break
+                for kind, title, size in rows:
+                    self.connection.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, title))
+                    self.disk_bytes -= size
+                    self.disk_evictions += 1
+                    if self.disk_bytes <= self.disk_budget_bytes:
+                        break
+
+
+_shared_page_cache: Optional[PageCache] = None
+_shared_memory_page_cache: Optional[PageCache] = None
+
+
+# Returns the cache shared by every WikiApi instance, creating it on first use. Only network sources are worth keeping
+# on disk: pages of local and in-memory sources are cheap to read again, and a disk entry could outlive the graph or
+# store it came from and be served to a later process. Those get a shared cache kept in memory only
+def get_shared_page_cache(persistent=True) -> PageCache:
+    global _shared_page_cache, _shared_memory_page_cache
+    if not persistent:
+        if _shared_memory_page_cache is None:
+            _shared_memory_page_cache = PageCache()
+        return _shared_memory_page_cache
+    if _shared_page_cache is None:
+        try:
+            _shared_page_cache = PageCache(disk_path=DEFAULT_CACHE_PATH)
+        except (OSError, sqlite3.Error):
+            # Fall back to memory only if the cache directory is not writable
+            _shared_page_cache = PageCache()
+    return _shared_page_cache
+
+
+# Replaces the shared cache, e.g. to change its size or location
+def set_shared_page_cache(cache: PageCache) -> None:
+    global _shared_page_cache
+    _shared_page_cache = cache
@@ -0,0 +1,234 @@
+# Page sources supply the link lists and text bodies that WikiApi searches over. The live Wikipedia API is the
+# default, but any object with the same methods (such as the local LocalPageStore) can be handed to WikiApi instead
+import itertools
+import threading
+from abc import ABC, abstractmethod
+import requests
+import wikipediaapi # Wikipedia API library
+from typing import Optional
+from .titles import normalize_title
+
+# Most titles the MediaWiki API accepts in one query
+MAX_TITLES_PER_QUERY = 50
+
+
+# Base class for everything WikiApi can read pages from
+class PageSource(ABC):
+    # Identifies the source in shared caches so pages from different sources never mix
+    name = "source"
+    # Whether titles can be aliases of other pages, only then are links looked up through resolve_titles
+    has_redirects = False
+    # Whether pages are worth keeping in the on-disk cache across runs, only for sources read over the network
+    persistent_cache = False
+
+    # Returns list of page titles that given page points to, or None if the page does not exist
+    @abstractmethod
+    def get_links(self, page_title) -> Optional[list[str]]: pass
+
+    # Returns text body of given page, or None if the page does not exist
+    @abstractmethod
+    def get_text(self, page_title) -> Optional[str]: pass
+
+    # Returns list of titles of pages that link to given page, or None if the page does not exist
+    @abstractmethod
+    def get_backlinks(self, page_title) -> Optional[list[str]]: pass
+
+    # Returns list of titles that redirect to given page. Sources that know nothing about redirects have none
+    def get_redirects(self, page_title) -> list[str]:
+        return []
+
+    # Returns a dictionary of title -> links (None if the page does not exist) for several pages at once. Sources
+    # that can answer many titles in one request override this
+    def get_links_many(self, page_titles: list[str]) -> dict[str, Optional[list[str]]]:
+        return {page_title: self.get_links(page_title) for page_title in page_titles}
+
+    # Returns a dictionary of title -> canonical title, following redirects, or None if the page does not exist.
+    # Sources without redirects treat every title as canonical and leave missing pages to get_links
+    def resolve_titles(self, page_titles: list[str]) -> dict[str, Optional[str]]:
+        return {page_title: normalize_title(page_title) for page_title in page_titles}
+
+    # Returns how many requests the source has made on the calling thread, None if it does not count them. Callers
+    # sharing the source with other threads take the difference around a call to learn what that call cost
+    def get_thread_requests(self) -> Optional[int]:
+        return None
+
+
+# Reads pages from Wikipedia over the network
+class WikipediaPageSource(PageSource):
+    def __init__(self, user_agent='DSA_Project3', language='en', max_backlinks=5000, pool_size=10):
+        # Initialize the Wikipedia API
+        self.wiki = wikipediaapi.Wikipedia(user_agent, language)
+        self.name = f"wikipedia:{language}"
+        self.has_redirects = True
+        self.persistent_cache = True
+        self.user_agent = user_agent
+        # Endpoint for clients that talk to the MediaWiki API directly
+        self.api_url = f"https://{language}.wikipedia.org/w/api.php"
+        # Pooled session for batched queries that go around wikipediaapi
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        # Keep up to pool_size connections alive, enough for every thread searching through this source at once
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        # Requests sent through the session, counted per thread
+        self.thread_state = threading.local()
+        # Popular pages have hundreds of thousands of backlinks, only this many are read
+        self.max_backlinks = max_backlinks
+
+    def get_links(self, page_title) -> Optional[list[str]]:
+        # Fetch the page for the given title
+        page = self.wiki.page(page_title)
+        if not page.exists():
+            return None
+        # Titles of every page linked from the body
+        return [link.title for link in page.links.values()]
+
+    # Counts only the queries sent through the session, not those wikipediaapi makes for get_links and get_text
+    def get_thread_requests(self) -> Optional[int]:
+        return getattr(self.thread_state, "requests", 0)
+
+    # Sends one API query through the pooled session and returns the decoded JSON response
+    def query(self, params: dict) -> dict:
+        self.thread_state.requests = getattr(self.thread_state, "requests", 0) + 1
+        response = self.session.get(self.api_url, params=params, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def get_text(self, page_title) -> Optional[str]:
+        # Fetch the page for the given title
+        page = self.wiki.page(page_title)
+        if not page.exists():
+            return None
+        return page.text
+
+    # Reads prop=linkshere for a page, main namespace articles only
+    def get_backlinks(self, page_title) -> Optional[list[str]]:
+        params = {"action": "query", "format": "json", "formatversion": "2", "prop": "linkshere",
+                  "titles": page_title, "lhlimit": "max", "lhnamespace": "0"}
+        backlinks = []
+        while len(backlinks) < self.max_backlinks:
+            data = self.query(params)
+            pages = data.get("query", {}).get("pages", [])
+            if not pages or pages[0].get("missing") or pages[0].get("invalid"):
+                return None
+            backlinks.extend(link["title"] for link in pages[0].get("linkshere", []))
+            if "continue" not in data:
+                break
+            params = {**params, **data["continue"]}
+        return backlinks[:self.max_backlinks]
+
+    # Reads prop=redirects for a page, main namespace aliases only
+    def get_redirects(self, page_title) -> list[str]:
+        params = {"action": "query", "format": "json", "formatversion": "2", "prop": "redirects",
+                  "titles": page_title, "rdlimit": "max", "rdnamespace": "0"}
+        redirects = []
+        while True:
+            data = self.query(params)
+            pages = data.get("query", {}).get("pages", [])
+            if not pages or pages[0].get("missing") or pages[0].get("invalid"):
+                return []
+            redirects.extend(redirect["title"] for redirect in pages[0].get("redirects", []))
+            if "continue" not in data:
+                return redirects
+            params = {**params, **data["continue"]}
+
+    # Asks for the links of up to 50 titles per request instead of one request per title
+    def get_links_many(self, page_titles: list[str]) -> dict[str, Optional[list[str]]]:
+        results = {}
+        for start in range(0, len(page_titles), MAX_TITLES_PER_QUERY):
+            results.update(self.query_links(page_titles[start:start + MAX_TITLES_PER_QUERY]))
+        return results
+
+    # Resolves up to 50 titles in one query, following redirects
+    def resolve_titles(self, page_titles: list[str]) -> dict[str, Optional[str]]:
+        params = {"action": "query", "format": "json", "formatversion": "2", "redirects": "1",
+                  "titles": "|".join(page_titles)}
+        query = self.query(params).get("query", {})
+        # Each title goes through normalization, then at most one redirect, to land on a page
+        normalized = {alias["from"]: alias["to"] for alias in query.get("normalized", [])}
+        redirects = {redirect["from"]: redirect["to"] for redirect in query.get("redirects", [])}
+        missing = {page["title"] for page in query.get("pages", []) if page.get("missing") or page.get("invalid")}
+        results = {}
+        for page_title in page_titles:
+            canonical = normalized.get(page_title, page_title)
+            canonical = redirects.get(canonical, canonical)
+            results[page_title] = None if canonical in missing else canonical
+        return results
+
+    # Runs one multi-title prop=links query, following continuations until every page's links are in. Redirects are
+    # followed like wikipediaapi does for single pages, so a redirect title gets the links of the article it leads to
+    def query_links(self, page_titles: list[str]) -> dict[str, Optional[list[str]]]:
+        params = {"action": "query", "format": "json", "formatversion": "2", "prop": "links", "redirects": "1",
+                  "titles": "|".join(page_titles), "pllimit": "max"}
+        links = {}
+        missing = set()
+        # The API answers under normalized titles and redirect targets, mapped back to the titles asked for below
+        normalized = {}
+        redirects = {}
+        while True:
+            data = self.query(params)
+            query = data.get("query", {})
+            normalized.update((alias["from"], alias["to"]) for alias in query.get("normalized", []))
+            redirects.update((redirect["from"], redirect["to"]) for redirect in query.get("redirects", []))
+            for page in query.get("pages", []):
+                if page.get("missing") or page.get("invalid"):
+                    missing.add(page["title"])
+                    continue
+                # Links of one page can be split over several continuation responses
+                links.setdefault(page["title"], []).extend(link["title"] for link in page.get("links", []))
+            if "continue" not in data:
+                break
+            params = {**params, **data["continue"]}
+        results = {}
+        for page_title in page_titles:
+            # Each title goes through normalization, then at most one redirect, to land on a page
+            answered_as = normalized.get(page_title, page_title)
+            answered_as = redirects.get(answered_as, answered_as)
+            results[page_title] = None if answered_as in missing else links.get(answered_as)
+        return results
+
+
+_dict_source_numbers = itertools.count(1)
+
+
+# Serves pages held in memory, used for benchmarks and small hand-built graphs
+class DictPageSource(PageSource):
+    def __init__(self, links: dict[str, list[str]], texts: Optional[dict[str, str]] = None, name=None,
+                 redirects: Optional[dict[str, str]] = None):
+        self.links = links
+        self.texts = texts if texts is not None else {}
+        # Unnamed sources get a name of their own so two different graphs never share cache entries
+        self.name = name if name is not None else f"memory:{next(_dict_source_numbers)}"
+        # Redirect title -> title of the page it leads to
+        self.redirects = redirects if redirects is not None else {}
+        self.has_redirects = bool(self.redirects)
+        self.backlinks = None
+
+    def get_links(self, page_title) -> Optional[list[str]]:
+        return self.links.get(page_title)
+
+    def get_text(self, page_title) -> Optional[str]:
+        if page_title not in self.links and page_title not in self.texts:
+            return None
+        return self.texts.get(page_title, "")
+
+    def get_backlinks(self, page_title) -> Optional[list[str]]:
+        # Reverse index built on first use, a link to a redirect counts as a link to the page it leads to
+        if self.backlinks is None:
+            self.backlinks = {}
+            for source_title, links in self.links.items():
+                for link in links:
+                    self.backlinks.setdefault(self.redirects.get(link, link), []).append(source_title)
+        if page_title not in self.links and page_title not in self.backlinks:
+            return None
+        return self.backlinks.get(page_title, [])
+
+    def get_redirects(self, page_title) -> list[str]:
+        return [alias for alias, redirect_target in self.redirects.items() if redirect_target == page_title]
+
+    def resolve_titles(self, page_titles: list[str]) -> dict[str, Optional[str]]:
+        results = {}
+        for page_title in page_titles:
+            canonical = self.redirects.get(page_title, page_title)
+            results[page_title] = canonical if canonical in self.links or canonical in self.texts else None
+        return results
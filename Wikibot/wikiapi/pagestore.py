@@ -0,0 +1,140 @@
+# Local SQLite corpus of pages (titles, out links and text) so searches can run at disk speed without the network.
+# Build one with the importer:  python -m Wikibot.wikiapi.pagestore corpus.db pages.jsonl [more.jsonl ...]
+# where every line of the JSONL input looks like {"title": "...", "links": ["...", ...], "text": "..."}
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from typing import Iterable, Optional
+from .pagesource import PageSource
+from .titles import normalize_title
+
+_word = re.compile(r'\w+')
+
+_schema = """
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    text TEXT,
+    token_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS links (
+    page_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    target TEXT NOT NULL,
+    PRIMARY KEY (page_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS links_target ON links (target);
+"""
+
+
+class LocalPageStore(PageSource):
+    def __init__(self, path):
+        self.path = path
+        self.name = f"local:{os.path.abspath(path)}"
+        # One connection shared by every thread, guarded by a lock, so prefetch workers can read concurrently
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock:
+            self.connection.executescript(_schema)
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+    # Returns the row id of a page, or None if it is not in the store
+    def get_page_id(self, page_title) -> Optional[int]:
+        with self.lock:
+            row = self.connection.execute("SELECT id FROM pages WHERE key = ?",
+                                          (normalize_title(page_title),)).fetchone()
+        return None if row is None else row[0]
+
+    def get_links(self, page_title) -> Optional[list[str]]:
+        page_id = self.get_page_id(page_title)
+        if page_id is None:
+            return None
+        with self.lock:
+            rows = self.connection.execute("SELECT target FROM links WHERE page_id = ? ORDER BY position",
+                                           (page_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def get_backlinks(self, page_title) -> Optional[list[str]]:
+        if self.get_page_id(page_title) is None:
+            return None
+        # Links are stored as written on the page, so match both the given and the normalized spelling
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT DISTINCT pages.title FROM links JOIN pages ON pages.id = links.page_id "
+                "WHERE links.target IN (?, ?) ORDER BY pages.id",
+                (page_title, normalize_title(page_title))).fetchall()
+        return [row[0] for row in rows]
+
+    def get_text(self, page_title) -> Optional[str]:
+        with self.lock:
+            row = self.connection.execute("SELECT text FROM pages WHERE key = ?",
+                                          (normalize_title(page_title),)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return row[0]
+
+    # Returns the number of word tokens counted for a page at import time
+    def get_token_count(self, page_title) -> int:
+        with self.lock:
+            row = self.connection.execute("SELECT token_count FROM pages WHERE key = ?",
+                                          (normalize_title(page_title),)).fetchone()
+        return 0 if row is None else row[0]
+
+    # Returns the number of pages in the store
+    def get_page_count(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    # Returns the titles of every page in the store
+    def get_titles(self) -> list[str]:
+        with self.lock:
+            return [row[0] for row in self.connection.execute("SELECT title FROM pages ORDER BY id")]
+
+    # Inserts or replaces a single page and its out links
+    def add_page(self, page_title, links, text=None) -> None:
+        self.import_pages([{"title": page_title, "links": links, "text": text}])
+
+    # Imports an iterable of {"title", "links", "text"} dictionaries in a single transaction, returns pages imported
+    def import_pages(self, pages: Iterable[dict]) -> int:
+        imported = 0
+        with self.lock, self.connection:
+            for page in pages:
+                title = normalize_title(page["title"])
+                text = page.get("text")
+                token_count = sum(1 for _ in _word.finditer(text)) if text else 0
+                self.connection.execute("DELETE FROM links WHERE page_id = (SELECT id FROM pages WHERE key = ?)",
+                                        (title,))
+                self.connection.execute(
+                    "INSERT INTO pages (key, title, text, token_count) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET title = excluded.title, text = excluded.text, "
+                    "token_count = excluded.token_count",
+                    (title, page["title"], text, token_count))
+                page_id = self.connection.execute("SELECT id FROM pages WHERE key = ?", (title,)).fetchone()[0]
+                self.connection.executemany("INSERT INTO links (page_id, position, target) VALUES (?, ?, ?)",
+                                            [(page_id, position, link)
+                                             for position, link in enumerate(page.get("links", []))])
+                imported += 1
+        return imported
+
+    # Imports a JSONL dump where every line is one page, returns pages imported
+    def import_jsonl(self, path) -> int:
+        with open(path, encoding="utf-8") as file:
+            return self.import_pages(json.loads(line) for line in file if line.strip())
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("Usage: python -m Wikibot.wikiapi.pagestore <store.db> <pages.jsonl> [more.jsonl ...]")
+        sys.exit(1)
+    store = LocalPageStore(sys.argv[1])
+    for dump in sys.argv[2:]:
+        print(f"Imported {store.import_jsonl(dump)} pages from {dump}")
+    print(f"Store now holds {store.get_page_count()} pages")
+    store.close()
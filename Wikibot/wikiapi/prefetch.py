@@ -0,0 +1,68 @@
+# Speculatively fetches link lists on a thread pool so the pages a search is likely to expand next are already
+# downloaded by the time it gets to them
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+
+class LinkPrefetcher:
+    def __init__(self, fetch: Callable[[str], Optional[list[str]]], workers=4,
+                 fetch_many: Optional[Callable[[list[str]], dict]] = None):
+        # Function that returns the links of a page, run on the worker threads
+        self.fetch = fetch
+        # Optional function returning a title -> links dictionary for many pages, used to prefetch in one request
+        self.fetch_many = fetch_many
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wikibot-prefetch")
+        # Titles currently being fetched (or already fetched but not yet used) and their futures. With fetch_many
+        # several titles share one future
+        self.futures: dict[str, Future] = {}
+        # Counters for tuning the prefetch depth and worker count
+        self.submitted = 0
+        self.used = 0
+
+    # Makes the given titles the ones being prefetched. Fetches for titles that dropped out of the set are cancelled
+    # if they have not started yet, finished ones are forgotten since their result already sits in the page cache
+    def prefetch(self, page_titles: Iterable[str]) -> None:
+        wanted = list(dict.fromkeys(page_titles))
+        wanted_set = set(wanted)
+        still_wanted = {self.futures[page_title] for page_title in wanted if page_title in self.futures}
+        for page_title in list(self.futures):
+            if page_title not in wanted_set:
+                future = self.futures[page_title]
+                # A batch future is only cancelled when none of its titles are wanted any more
+                if future.done() or (future not in still_wanted and future.cancel()):
+                    del self.futures[page_title]
+        new_titles = [page_title for page_title in wanted if page_title not in self.futures]
+        if not new_titles:
+            return
+        if self.fetch_many is not None:
+            future = self.executor.submit(self.fetch_many, new_titles)
+            for page_title in new_titles:
+                self.futures[page_title] = future
+        else:
+            for page_title in new_titles:
+                self.futures[page_title] = self.executor.submit(self.fetch, page_title)
+        self.submitted += len(new_titles)
+
+    # Returns the links of a page, waiting on its prefetch if one was started and fetching directly otherwise
+    def get(self, page_title) -> Optional[list[str]]:
+        future = self.futures.pop(page_title, None)
+        if future is not None and not future.cancelled():
+            self.used += 1
+            result = future.result()
+            return result.get(page_title) if self.fetch_many is not None else result
+        return self.fetch(page_title)
+
+    # Returns title -> links of the prefetched pages whose fetch has finished, without using them up
+    def get_ready(self) -> dict[str, Optional[list[str]]]:
+        ready = {}
+        for page_title, future in self.futures.items():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                ready[page_title] = future.result().get(page_title) if self.fetch_many is not None else future.result()
+        return ready
+
+    # Stops the worker threads, dropping fetches that have not started
+    def shutdown(self) -> None:
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
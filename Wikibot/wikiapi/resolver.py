@@ -0,0 +1,78 @@
+# Maps the many names of an article (different case, underscores, redirect aliases) to one canonical title so a
+# search visits and fetches every article once. Unknown titles are resolved in batches through the page source, and
+# the answers are kept in the page cache, which persists them on disk. Titles that turned out not to exist are
+# remembered the same way so they are never requested again
+from typing import Iterable, Optional
+from .pagecache import PageCache
+from .pagesource import MAX_TITLES_PER_QUERY, PageSource
+from .titles import normalize_title
+
+# Stored in place of a canonical title for pages that do not exist
+MISSING = ""
+
+
+class TitleResolver:
+    def __init__(self, page_source: PageSource, page_cache: PageCache):
+        self.page_source = page_source
+        self.page_cache = page_cache
+        self.kind = page_source.name + "/canonical"
+        # Normalized title -> canonical title (MISSING for pages that do not exist) of every title seen so far
+        self.canonical = {}
+        # Number of page source requests made to resolve titles
+        self.requests = 0
+
+    # Returns the canonical title of a title already resolved (MISSING if the page does not exist), None if unknown
+    def lookup(self, page_title) -> Optional[str]:
+        normalized = normalize_title(page_title)
+        canonical = self.canonical.get(normalized)
+        if canonical is None:
+            # Not counted as a page cache hit or miss, the counters size the cache for page data
+            canonical = self.page_cache.get(self.kind, normalized, count=False)
+            if canonical is not None:
+                self.canonical[normalized] = canonical
+        return canonical
+
+    # Returns a dictionary of title -> canonical title (None if the page does not exist). Titles not resolved
+    # before are asked for together, up to MAX_TITLES_PER_QUERY per request. Sources without redirects are never
+    # asked, their titles only need normalizing
+    def resolve_many(self, page_titles: Iterable[str]) -> dict[str, Optional[str]]:
+        results = {}
+        misses = []
+        for page_title in page_titles:
+            canonical = self.lookup(page_title)
+            if canonical is None and not self.page_source.has_redirects:
+                results[page_title] = normalize_title(page_title)
+            elif canonical is None:
+                misses.append(page_title)
+            else:
+                results[page_title] = canonical or None
+        if misses:
+            unknown = list(dict.fromkeys(normalize_title(page_title) for page_title in misses))
+            for start in range(0, len(unknown), MAX_TITLES_PER_QUERY):
+                chunk = unknown[start:start + MAX_TITLES_PER_QUERY]
+                self.requests += 1
+                resolved = self.page_source.resolve_titles(chunk)
+                for normalized in chunk:
+                    self.remember(normalized, resolved.get(normalized))
+            for page_title in misses:
+                results[page_title] = self.canonical[normalize_title(page_title)] or None
+        return results
+
+    # Returns the canonical title of one title, None if the page does not exist
+    def resolve(self, page_title) -> Optional[str]:
+        return self.resolve_many([page_title])[page_title]
+
+    # Records what a title resolves to (None if the page does not exist). A canonical title resolves to itself
+    def remember(self, page_title, canonical: Optional[str]) -> None:
+        for title in (page_title, canonical) if canonical else (page_title,):
+            normalized = normalize_title(title)
+            self.canonical[normalized] = canonical or MISSING
+            self.page_cache.put(self.kind, normalized, canonical or MISSING)
+
+    # Returns whether a title is known not to exist
+    def is_missing(self, page_title) -> bool:
+        return self.lookup(page_title) == MISSING
+
+    # Forgets the titles resolved by this resolver, the page cache keeps its copy
+    def clear(self) -> None:
+        self.canonical.clear()
@@ -0,0 +1,220 @@
+# Link scorers rank the links of a page by how related their titles are to a target profile. Searches hand a scorer
+# every link of a page at once and keep the n best, so it can work on the whole batch. Pick one with
+# WikiApi(..., scorer=...):
+#   RelationScorer  the default, the average target page weight of the title's words (see scoring.py)
+#   BM25Scorer      Okapi BM25 of the title against the target page's words, with inverse document frequencies taken
+#                   from a table built over a local corpus:
+#                     python -m Wikibot.wikiapi.scorers df_table.npz corpus.db|pages.jsonl
+import heapq
+import json
+import sys
+from abc import ABC, abstractmethod
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable
+import numpy as np
+from .scoring import STOP_WORDS, VECTORIZE_MIN_TITLES, score_title, top_titles_vectorized
+from .targetprofile import TargetProfile
+from .tokenizer import iter_words
+
+
+# Base class for link scorers
+class LinkScorer(ABC):
+    # Names the scorer in reports and on the command line
+    name = "scorer"
+
+    # Returns the n titles with the highest score against a profile and their scores, best first. Ties keep the order
+    # the titles were given in
+    @abstractmethod
+    def top_n(self, titles: list[str], profile: TargetProfile, n: int) -> dict[str, float]: pass
+
+
+class RelationScorer(LinkScorer):
+    name = "relation"
+
+    def __init__(self, stop_words=STOP_WORDS):
+        self.stop_words = stop_words
+
+    def top_n(self, titles: list[str], profile: TargetProfile, n: int) -> dict[str, float]:
+        # Pages with many links (lists, countries) are scored in a few array operations and only the top N are
+        # selected, instead of sorting every score
+        if len(titles) >= VECTORIZE_MIN_TITLES:
+            return dict(top_titles_vectorized(list(dict.fromkeys(titles)), profile.vocabulary, self.stop_words, n))
+
+        # Score each title by the average weight of its words, using the profile's weight table built once per page
+        links_and_indices = {title: score_title(title, profile.weights, self.stop_words) for title in titles}
+
+        # Return subset of links and their similarity indices, sorted by decreasing index
+        links_and_indices = dict(sorted(links_and_indices.items(), key=lambda item: item[1], reverse=True))
+        return {x: links_and_indices[x] for x in list(links_and_indices)[:n]}
+
+
+# Number of corpus pages each word appears in, with the page count and mean title length BM25 needs. Words are one
+# sorted array of fixed width UTF-8 strings with their counts in an int32 array alongside, so a lookup is a binary
+# search (np.searchsorted) and the whole table is two arrays in a single .npz file. Words longer than MAX_WORD_BYTES
+# are left out and count as never seen, so one stray long token does not widen every entry
+MAX_WORD_BYTES = 40
+
+
+class DocumentFrequencyTable:
+    def __init__(self, words: np.ndarray, counts: np.ndarray, document_count: int, mean_title_length: float):
+        # Sorted, dtype S<width>
+        self.words = words
+        self.counts = counts
+        self.document_count = document_count
+        self.mean_title_length = mean_title_length
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    # Builds a table from unsorted word -> count pairs
+    @staticmethod
+    def from_counts(word_counts: dict[str, int], document_count: int,
+                    mean_title_length: float) -> "DocumentFrequencyTable":
+        encoded = {word.encode("utf-8"): count for word, count in word_counts.items()}
+        encoded = {word: count for word, count in encoded.items() if len(word) <= MAX_WORD_BYTES}
+        width = max(map(len, encoded), default=1)
+        words = np.array(sorted(encoded), dtype=f"S{width}")
+        counts = np.fromiter((encoded[word] for word in words.tolist()), dtype=np.int32, count=len(words))
+        return DocumentFrequencyTable(words, counts, document_count, mean_title_length)
+
+    # Returns the number of pages each uppercased word appears in, 0 for words the corpus never uses
+    def get_counts(self, words: list[str]) -> np.ndarray:
+        counts = np.zeros(len(words), dtype=np.int32)
+        if not len(self.words) or not words:
+            return counts
+        encoded = [word.encode("utf-8") for word in words]
+        # Longer words would be cut to the array width and could match a different word
+        fits = np.fromiter((len(word) <= self.words.itemsize for word in encoded), dtype=bool, count=len(encoded))
+        queries = np.array(encoded, dtype=self.words.dtype)
+        indices = np.minimum(np.searchsorted(self.words, queries), len(self.words) - 1)
+        found = fits & (self.words[indices] == queries)
+        counts[found] = self.counts[indices[found]]
+        return counts
+
+    def get_count(self, word) -> int:
+        return int(self.get_counts([word])[0])
+
+    # Returns the BM25 inverse document frequency of uppercased words, always positive
+    def idfs(self, words: list[str]) -> np.ndarray:
+        counts = self.get_counts(words)
+        return np.log1p((self.document_count - counts + 0.5) / (counts + 0.5))
+
+    def idf(self, word) -> float:
+        return float(self.idfs([word])[0])
+
+    def save(self, path) -> None:
+        np.savez(path, words=self.words, counts=self.counts, document_count=self.document_count,
+                 mean_title_length=self.mean_title_length)
+
+    @staticmethod
+    def load(path) -> "DocumentFrequencyTable":
+        with np.load(path) as data:
+            return DocumentFrequencyTable(data["words"], data["counts"].astype(np.int32),
+                                          int(data["document_count"]), float(data["mean_title_length"]))
+
+
+# Returns the table of a .npz file, loaded once however many scorers and searches use it
+@lru_cache(maxsize=4)
+def load_document_frequencies(path) -> DocumentFrequencyTable:
+    return DocumentFrequencyTable.load(path)
+
+
+# Counts document frequencies over (title, text) pairs, stop words excluded
+def build_document_frequencies(pages: Iterable[tuple[str, str]], stop_words=STOP_WORDS) -> DocumentFrequencyTable:
+    counts = Counter()
+    document_count = 0
+    title_words = 0
+    for title, text in pages:
+        document_count += 1
+        title_words += sum(1 for word in iter_words(title) if word not in stop_words)
+        counts.update({word for word in iter_words(text or "") if word not in stop_words})
+    return DocumentFrequencyTable.from_counts(counts, document_count,
+                                              title_words / document_count if title_words else 1.0)
+
+
+# Scores a link title as a BM25 document and the target page as the query: each title word found on the target adds
+# its inverse document frequency, saturated by how often it appears on the target (k3) and in the title (k1), with
+# titles longer than the corpus mean counting for less (b). Word uniqueness comes from the corpus instead of wordfreq,
+# so the uniqueness setting does not change the scores
+class BM25Scorer(LinkScorer):
+    name = "bm25"
+
+    def __init__(self, document_frequencies: DocumentFrequencyTable, k1=1.2, b=0.75, k3=8.0, stop_words=STOP_WORDS):
+        self.document_frequencies = document_frequencies
+        self.k1 = k1
+        self.b = b
+        self.k3 = k3
+        self.stop_words = stop_words
+
+    # Returns word -> query weight (inverse document frequency times saturated target count) for a profile, built
+    # once per profile and kept on it
+    def get_query_weights(self, profile: TargetProfile) -> dict[str, float]:
+        query_weights = profile.scorer_tables.get(self)
+        if query_weights is None:
+            words = list(profile.word_frequency)
+            idfs = self.document_frequencies.idfs(words)
+            query_weights = {word: float(idf) * (self.k3 + 1) * count / (self.k3 + count)
+                             for word, idf, count in zip(words, idfs, profile.word_frequency.values())}
+            profile.scorer_tables[self] = query_weights
+        return query_weights
+
+    # Returns the BM25 score of one title
+    def score(self, page_title, query_weights: dict[str, float]) -> float:
+        words = [word for word in iter_words(page_title) if word not in self.stop_words]
+        if not words:
+            return 0
+        length_norm = self.k1 * (1 - self.b + self.b * len(words) / self.document_frequencies.mean_title_length)
+        total = 0.0
+        for word in set(words):
+            query_weight = query_weights.get(word)
+            if query_weight is not None:
+                term_count = words.count(word)
+                total += query_weight * term_count * (self.k1 + 1) / (term_count + length_norm)
+        return total
+
+    def top_n(self, titles: list[str], profile: TargetProfile, n: int) -> dict[str, float]:
+        query_weights = self.get_query_weights(profile)
+        scores = ((title, self.score(title, query_weights)) for title in dict.fromkeys(titles))
+        # nlargest keeps the earlier title on ties, like a stable sort
+        return dict(heapq.nlargest(n, scores, key=lambda item: item[1]))
+
+
+# Names of the scorers create_scorer() knows
+SCORERS = ("relation", "bm25")
+
+
+# Returns the scorer with the given name, as picked on the command line
+def create_scorer(name, document_frequencies_path=None) -> LinkScorer:
+    if name == "bm25":
+        if document_frequencies_path is None:
+            raise ValueError("The bm25 scorer needs a document frequency table")
+        return BM25Scorer(load_document_frequencies(document_frequencies_path))
+    return RelationScorer()
+
+
+# Reads (title, text) pairs from a LocalPageStore file or a JSONL dump
+def read_texts(path) -> Iterable[tuple[str, str]]:
+    if path.endswith(".db"):
+        from .pagestore import LocalPageStore
+        store = LocalPageStore(path)
+        try:
+            for title in store.get_titles():
+                yield title, store.get_text(title) or ""
+        finally:
+            store.close()
+        return
+    with open(path, encoding="utf-8") as pages_file:
+        for line in pages_file:
+            if line.strip():
+                page = json.loads(line)
+                yield page["title"], page.get("text") or ""
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python -m Wikibot.wikiapi.scorers df_table.npz corpus.db|pages.jsonl")
+        sys.exit(1)
+    table = build_document_frequencies(read_texts(sys.argv[2]))
+    table.save(sys.argv[1])
+    print(f"Wrote document frequencies of {len(table)} words over {table.document_count} pages to {sys.argv[1]}")
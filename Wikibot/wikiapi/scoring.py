@@ -0,0 +1,84 @@
+# Word weights behind the relation score of a link title. A word's weight is how often it appears on the target
+# page, multiplied by how uncommon it is in English when word uniqueness is enabled
+import math
+from functools import lru_cache
+import numpy as np
+import wordfreq # Used for determining word uniqueness
+
+# Common words left out of word frequencies and title scores
+STOP_WORDS = frozenset({'WAS', 'MUCH', 'WERE', 'AN', 'S', 'WHEN', 'HAD', 'BUT',
+                        'IT', 'IS', 'A', 'ON', 'WHAT', 'CAN', 'HAVE', 'SHALL', 'OUT',
+                        'THAN', 'BE', 'WITH', 'OF', 'DO', 'MAY', 'DOES', 'OUGHT', 'FOR',
+                        'IN', 'MIGHT', 'WHO', 'WILL', 'THIS', 'ITS', 'WHICH', 'DOWN', 'BEING',
+                        'MANY', 'WOULD', 'FROM', 'ABOUT', 'AS', 'COULD', 'BEEN', 'THAT',
+                        'MUST', 'OR', 'SUCH', 'UP', 'HAS', 'BY', 'AND', 'DID', 'TO', 'THE',
+                        'SHOULD', 'ARE', 'ALSO', 'AT'})
+
+
+# Returns the uniqueness weight of a word, memoized since the same words recur on every page of a search
+@lru_cache(maxsize=1 << 16)
+def word_uniqueness_weight(word: str) -> float:
+    word_uniqueness = wordfreq.word_frequency(word, "en")
+    # Word uniqueness method as determined through experimentation
+    if word_uniqueness <= 0:
+        return 10
+    return -1 * math.log10(word_uniqueness) - 1
+
+
+# Returns a dictionary of word -> weight for every word of the target page, built once per target so scoring a link
+# is plain dictionary arithmetic
+def build_weight_table(word_frequency: dict[str, int], adjust_for_word_uniqueness=True) -> dict[str, float]:
+    if not adjust_for_word_uniqueness:
+        return {word: float(count) for word, count in word_frequency.items()}
+    return {word: count * word_uniqueness_weight(word) for word, count in word_frequency.items()}
+
+
+# Returns the relation score of a link title: the average weight of its words, stop words excluded
+def score_title(page_title: str, weights: dict[str, float], stop_words) -> float:
+    words = [word for word in page_title.upper().split() if word not in stop_words]
+    if not words:
+        return 0
+    return sum(weights.get(word, 0) for word in words) / len(words)
+
+
+# Pages with at least this many links are scored with NumPy, smaller ones in plain Python
+VECTORIZE_MIN_TITLES = 64
+
+
+# Weight table laid out as an array: every target word gets an integer id (0 is reserved for unknown words, which
+# weigh nothing) so a batch of titles can be scored with one gather
+class WeightVocabulary:
+    def __init__(self, weights: dict[str, float]):
+        self.word_ids = {word: index for index, word in enumerate(weights, start=1)}
+        self.weights = np.zeros(len(weights) + 1, dtype=np.float64)
+        self.weights[1:] = np.fromiter(weights.values(), dtype=np.float64, count=len(weights))
+
+
+# Returns the n titles with the highest relation score and their scores, best first. Ties keep the order the titles
+# were given in, the same result as a stable sort of every score
+def top_titles_vectorized(titles: list[str], vocabulary: WeightVocabulary, stop_words, n: int) -> list[tuple[str, float]]:
+    if not titles or n <= 0:
+        return []
+    # Tokenize every title into vocabulary ids, remembering how many words each one has
+    word_ids = []
+    lengths = np.empty(len(titles), dtype=np.int64)
+    get_id = vocabulary.word_ids.get
+    for index, title in enumerate(titles):
+        words = [get_id(word, 0) for word in title.upper().split() if word not in stop_words]
+        word_ids.extend(words)
+        lengths[index] = len(words)
+    # Gather each word's weight, sum them per title and average
+    word_weights = vocabulary.weights[np.asarray(word_ids, dtype=np.int64)]
+    totals = np.bincount(np.repeat(np.arange(len(titles)), lengths), weights=word_weights, minlength=len(titles))
+    scores = np.divide(totals, lengths, out=np.zeros(len(titles)), where=lengths > 0)
+    # Select the top n without sorting everything: everything above the n-th best score, then the earliest ties
+    if n < len(titles):
+        cutoff = -np.partition(-scores, n - 1)[n - 1]
+        above = np.flatnonzero(scores > cutoff)
+        ties = np.flatnonzero(scores == cutoff)[:n - len(above)]
+        top = np.concatenate((above, ties))
+    else:
+        top = np.arange(len(titles))
+    # Order the winners by decreasing score, then by position
+    top = top[np.lexsort((top, -scores[top]))]
+    return [(titles[index], float(scores[index])) for index in top]
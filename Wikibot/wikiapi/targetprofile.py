@@ -0,0 +1,127 @@
+# Everything a search needs to know about its target, built once and reused by every later search to the same target
+# with the same settings, so those skip fetching and tokenizing the target page
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+from .scoring import WeightVocabulary, build_weight_table
+from .titles import title_key
+
+
+@dataclass()
+class TargetProfile:
+    title: str
+    adjust_for_word_uniqueness: bool
+    # Word -> count on the target page, stop words excluded
+    word_frequency: dict[str, int]
+    # Titles that redirect to the target, a link to any of them reaches it too
+    redirects: tuple[str, ...] = ()
+    # Only this many of the words weighing most were kept, None if every word was
+    word_limit: Optional[int] = None
+    # Word -> weighted score used to rank link titles
+    weights: dict[str, float] = field(init=False)
+    vocabulary: WeightVocabulary = field(init=False, repr=False)
+    # Normalized titles that count as reaching the target
+    titles: frozenset[str] = field(init=False)
+    # Tables a link scorer derives from the profile, by scorer, so each is built once per profile
+    scorer_tables: dict = field(init=False, default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.weights = build_weight_table(self.word_frequency, self.adjust_for_word_uniqueness)
+        self.vocabulary = WeightVocabulary(self.weights)
+        self.titles = frozenset({title_key(self.title)} | {title_key(redirect) for redirect in self.redirects})
+
+    # Returns whether a link title is the target or one of its redirects
+    def is_target(self, page_title) -> bool:
+        return title_key(page_title) in self.titles
+
+
+class TargetProfileCache:
+    def __init__(self, max_profiles=256):
+        self.max_profiles = max_profiles
+        # (source name, target key, word limit, uniqueness setting) -> profile, word_frequency_key() -> word counts, and
+        # (source name, target key) -> redirects for the targets whose redirects were loaded
+        self.profiles = OrderedDict()
+        self.word_frequencies = OrderedDict()
+        self.redirects = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # Returns the profile for a target, building it on a miss. load_word_frequency is only called when the target's
+    # word counts are not cached under any setting, and load_redirects when its redirects were never loaded; an empty
+    # result (target not found) is not cached. Counts limited to the word_limit words weighing most are cached apart
+    # from full ones. A profile built without load_redirects (e.g. of a search's source) has no redirects, so it is
+    # rebuilt when looked up with load_redirects
+    def get(self, source_name, target_title, adjust_for_word_uniqueness,
+            load_word_frequency: Callable[[], dict[str, int]],
+            load_redirects: Optional[Callable[[], list[str]]] = None, word_limit: Optional[int] = None) -> TargetProfile:
+        key = self.word_frequency_key(source_name, target_title, word_limit, adjust_for_word_uniqueness)
+        redirects_key = (source_name, title_key(target_title))
+        profile_key = redirects_key + (word_limit, adjust_for_word_uniqueness)
+        with self.lock:
+            profile = self.profiles.get(profile_key)
+            if profile is not None and (load_redirects is None or redirects_key in self.redirects):
+                self.profiles.move_to_end(profile_key)
+                self.hits += 1
+                return profile
+            self.misses += 1
+            word_frequency = self.word_frequencies.get(key)
+            redirects = self.redirects.get(redirects_key)
+        if word_frequency is None:
+            word_frequency = load_word_frequency()
+        if redirects is None and load_redirects is not None and word_frequency:
+            redirects = tuple(load_redirects())
+        profile = TargetProfile(target_title, adjust_for_word_uniqueness, word_frequency, redirects or (), word_limit)
+        if word_frequency:
+            with self.lock:
+                self.word_frequencies[key] = word_frequency
+                if redirects is not None:
+                    self.redirects[redirects_key] = redirects
+                self.profiles[profile_key] = profile
+                self.trim(self.word_frequencies)
+                self.trim(self.redirects)
+                self.trim(self.profiles)
+        return profile
+
+    # Stores a profile built elsewhere so later searches to the same target reuse it
+    def put(self, source_name, profile: TargetProfile) -> None:
+        key = self.word_frequency_key(source_name, profile.title, profile.word_limit,
+                                      profile.adjust_for_word_uniqueness)
+        redirects_key = (source_name, title_key(profile.title))
+        with self.lock:
+            self.word_frequencies[key] = profile.word_frequency
+            self.redirects[redirects_key] = profile.redirects
+            self.profiles[redirects_key + (profile.word_limit, profile.adjust_for_word_uniqueness)] = profile
+            self.trim(self.word_frequencies)
+            self.trim(self.redirects)
+            self.trim(self.profiles)
+
+    # Returns the key word counts are cached under. Full counts serve both uniqueness settings, but which words a limit
+    # keeps depends on the setting, so limited counts are cached per setting
+    @staticmethod
+    def word_frequency_key(source_name, target_title, word_limit, adjust_for_word_uniqueness) -> tuple:
+        if word_limit is None:
+            return source_name, title_key(target_title), None
+        return source_name, title_key(target_title), word_limit, adjust_for_word_uniqueness
+
+    def clear(self) -> None:
+        with self.lock:
+            self.profiles.clear()
+            self.word_frequencies.clear()
+            self.redirects.clear()
+
+    def trim(self, entries: OrderedDict) -> None:
+        while len(entries) > self.max_profiles:
+            entries.popitem(last=False)
+
+
+_shared_profile_cache: Optional[TargetProfileCache] = None
+
+
+# Returns the profile cache shared by every WikiApi instance
+def get_shared_profile_cache() -> TargetProfileCache:
+    global _shared_profile_cache
+    if _shared_profile_cache is None:
+        _shared_profile_cache = TargetProfileCache()
+    return _shared_profile_cache
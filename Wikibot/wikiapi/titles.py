@@ -0,0 +1,18 @@
+# Helpers for comparing Wikipedia page titles
+import re
+
+_whitespace = re.compile(r'[\s_]+')
+
+
+# Returns the canonical form of a title: underscores become spaces, runs of whitespace collapse and the
+# first letter is capitalized, matching how MediaWiki itself normalizes titles
+def normalize_title(page_title: str) -> str:
+    title = _whitespace.sub(' ', page_title).strip()
+    if not title:
+        return title
+    return title[0].upper() + title[1:]
+
+
+# Returns a key for case-insensitive title comparison, used wherever searches check "is this the target"
+def title_key(page_title: str) -> str:
+    return normalize_title(page_title).upper()
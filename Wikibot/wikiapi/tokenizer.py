@@ -0,0 +1,61 @@
+# Word counting for page text. The text is tokenized one chunk at a time with a precompiled pattern: each chunk is
+# uppercased and split on its own and its words go straight into the counts, so a long article is never copied whole
+# (no text.upper() of everything, no list of every token). Text can also arrive as an iterable of chunks, e.g. read
+# from a file or a response body
+import heapq
+import re
+from collections import Counter
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+_word = re.compile(r'\w+')
+# Characters tokenized at once, large enough that per chunk overhead does not show
+CHUNK_SIZE = 1 << 16
+
+
+# Yields pieces of a text that never split a word. A string is cut about every chunk_size characters, an iterable
+# keeps the chunks it comes in
+def iter_chunks(text: Union[str, Iterable[str]], chunk_size=CHUNK_SIZE) -> Iterator[str]:
+    if isinstance(text, str):
+        start = 0
+        while start < len(text):
+            end = min(start + chunk_size, len(text))
+            # Move the cut past a word running over it
+            if end < len(text) and _word.match(text, end - 1):
+                running = _word.match(text, end)
+                if running is not None:
+                    end = running.end()
+            yield text[start:end]
+            start = end
+        return
+    carry = ""
+    for chunk in text:
+        chunk = carry + chunk if carry else chunk
+        # A word running up to the end of the chunk may go on in the next one, so it is held back
+        cut = len(chunk)
+        while cut > 0 and _word.match(chunk, cut - 1):
+            cut -= 1
+        carry = chunk[cut:]
+        if cut:
+            yield chunk[:cut]
+    if carry:
+        yield carry
+
+
+# Yields the words of a text, uppercased
+def iter_words(text: Union[str, Iterable[str]], chunk_size=CHUNK_SIZE) -> Iterator[str]:
+    for chunk in iter_chunks(text, chunk_size):
+        yield from _word.findall(chunk.upper())
+
+
+# Returns word -> count for a text, stop words excluded. With top_k only the top_k words of highest weight are kept, a
+# word's weight being its count times weight(word), or its plain count without a weight function
+def count_words(text: Union[str, Iterable[str]], stop_words=frozenset(), top_k: Optional[int] = None,
+                chunk_size=CHUNK_SIZE, weight: Optional[Callable[[str], float]] = None) -> dict[str, int]:
+    word_counts = Counter()
+    for chunk in iter_chunks(text, chunk_size):
+        word_counts.update(word for word in _word.findall(chunk.upper()) if word not in stop_words)
+    if top_k is not None and top_k < len(word_counts):
+        if weight is None:
+            return dict(heapq.nlargest(top_k, word_counts.items(), key=lambda item: item[1]))
+        return dict(heapq.nlargest(top_k, word_counts.items(), key=lambda item: item[1] * weight(item[0])))
+    return dict(word_counts)
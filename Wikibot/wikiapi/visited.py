@@ -0,0 +1,100 @@
+# Title indexed record of the pages a search has visited. Membership, parent lookup and each step of path
+# reconstruction are dictionary lookups instead of scans over every visited page. Every title is stored once in a
+# title table and given an int id; parents, depths and scores are kept by id in typed arrays, so a visit costs a
+# table entry and sixteen bytes of array instead of an object per page
+import math
+from array import array
+from typing import Iterator, Optional
+
+# Parent id of the source page
+NO_PARENT = -1
+
+
+# What a search remembers about one visited page, built on demand from the index arrays
+class VisitRecord:
+    __slots__ = ("title", "parent", "depth", "score")
+
+    def __init__(self, title: str, parent: str, depth: int, score: float = math.nan):
+        self.title = title
+        # Title of the page this one was reached from, "" for the source page
+        self.parent = parent
+        self.depth = depth
+        # Relation score the page was picked with, nan for searches that do not score it
+        self.score = score
+
+
+class VisitedIndex:
+    def __init__(self):
+        # Title table: id -> title and title -> id
+        self.titles: list[str] = []
+        self.ids: dict[str, int] = {}
+        # Visit data by id
+        self.parents = array("i")
+        self.depths = array("i")
+        self.scores = array("d")
+
+    def __contains__(self, page_title) -> bool:
+        return page_title in self.ids
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.titles)
+
+    # Returns the id of a visited title, None if it was never visited
+    def get_id(self, page_title) -> Optional[int]:
+        return self.ids.get(page_title)
+
+    def get_title(self, page_id) -> str:
+        return self.titles[page_id]
+
+    # Records a visit and returns its record, depth is one more than the parent's. Visiting a page again replaces its
+    # parent, depth and score
+    def add(self, page_title: str, parent_title: str = "", score: float = math.nan) -> VisitRecord:
+        parent_id = self.ids.get(parent_title, NO_PARENT) if parent_title != "" else NO_PARENT
+        depth = self.depths[parent_id] + 1 if parent_id != NO_PARENT else 0
+        page_id = self.ids.get(page_title)
+        if page_id is None:
+            page_id = len(self.titles)
+            self.ids[page_title] = page_id
+            self.titles.append(page_title)
+            self.parents.append(parent_id)
+            self.depths.append(depth)
+            self.scores.append(score)
+        else:
+            self.parents[page_id] = parent_id
+            self.depths[page_id] = depth
+            self.scores[page_id] = score
+        return VisitRecord(page_title, parent_title if parent_id != NO_PARENT else "", depth, score)
+
+    # Returns the record for a title, or None if it was never visited
+    def get(self, page_title) -> Optional[VisitRecord]:
+        page_id = self.ids.get(page_title)
+        if page_id is None:
+            return None
+        parent_id = self.parents[page_id]
+        return VisitRecord(page_title, self.titles[parent_id] if parent_id != NO_PARENT else "",
+                           self.depths[page_id], self.scores[page_id])
+
+    def clear(self) -> None:
+        self.titles.clear()
+        self.ids.clear()
+        del self.parents[:]
+        del self.depths[:]
+        del self.scores[:]
+
+    # Returns titles from the source page to the given page, or None if the page was never visited. Following parents
+    # stops at a page already on the path, should the parents ever form a cycle
+    def path_to(self, page_title) -> Optional[list[str]]:
+        page_id = self.ids.get(page_title)
+        if page_id is None:
+            return None
+        path = [self.titles[page_id]]
+        on_path = {page_id}
+        while self.parents[page_id] != NO_PARENT and self.parents[page_id] not in on_path:
+            page_id = self.parents[page_id]
+            on_path.add(page_id)
+            path.append(self.titles[page_id])
+        path.reverse()
+        return path
@@ -1,14 +1,34 @@
 # Necessary libraries
-import wikipediaapi # Wikipedia API library
-import wordfreq # Used for determining word uniqueness
+import asyncio
+import contextlib
 import heapq
-from collections import Counter, deque
 import math
-import re
+import threading
+from collections import deque
+from itertools import islice
 from typing import Optional
+from .budget import SearchBudget, SearchResult
+from .csrgraph import CSRGraph, shortest_path_ids
+from .frontier import BoundedPriorityQueue, iter_sorted
+from .events import EXPANDED, FINISHED, FOUND, SCORED, STATS, SearchEvent
+from .pagecache import PageCache, get_shared_page_cache
+from .pagesource import MAX_TITLES_PER_QUERY, PageSource, WikipediaPageSource
+from .prefetch import LinkPrefetcher
+from .resolver import TitleResolver
+from .scorers import LinkScorer, RelationScorer
+from .scoring import STOP_WORDS, WeightVocabulary, word_uniqueness_weight
+from .targetprofile import TargetProfile, TargetProfileCache, get_shared_profile_cache
+from .titles import title_key
+from .tokenizer import count_words
+from .visited import VisitedIndex, VisitRecord
 
 # Class with methods for entire wikipedia API
 class WikiApi:
+    # Search algorithms search() can run
+    SEARCH_MODES = ("greedy", "bfs", "async_bfs", "bidirectional", "astar", "beam", "exact")
+    # iter_search() reports the counters of the running search every this many expanded pages
+    STATS_INTERVAL = 25
+
     # Class with methods for a single wikipedia page
     class WikiPage:
         def __init__(self, parent_api, page_title):
@@ -23,74 +43,221 @@ class WikiApi:
 
         # Returns list of page titles that given page points to
         def get_page_links(self, page_title):
-            # Fetch the page for the given title
-            page = self.parent_wiki_api.wiki.page(page_title)
+            # Fetch the links for the given title, from the cache when possible
+            links_titles = self.parent_wiki_api.fetch_links(page_title)
 
             # Check if the page exists
-            if not page.exists():
+            if links_titles is None:
                 return "Page not found"
 
-            # List to store titles of linked pages
-            links_titles = []
-
-            # Loop through the links on the page
-            for link in page.links.values():
-                # Append the title of each linked page to the list
-                links_titles.append(link.title)
-
             return links_titles
 
         # Returns text body of given page
         def get_wikipedia_page_text(self):
-            # Fetch the page for the given title
-            page = self.parent_wiki_api.wiki.page(self.title)
+            # Fetch the text for the given title, from the cache when possible
+            text = self.parent_wiki_api.fetch_text(self.title)
 
             # Check if the page exists
-            if page.exists():
-                # Return the text of the page
-                return page.text
-            else:
+            if text is None:
                 return "Page not found"
+            return text
 
-        # Retuns a dictionary of word frequencies in a page body (excludes stop words)
-        def get_word_frequency(self):
+        # Retuns a dictionary of word frequencies in a page body (excludes stop words). With top_k only the top_k words
+        # that weigh most under the current uniqueness setting are kept
+        def get_word_frequency(self, top_k: Optional[int] = None):
             # Check if the page was found
             text = self.get_wikipedia_page_text()
             if text == "Page not found":
                 return "Page not found"
 
-            # Use Regex to clean and split the text into words, lowercasing to standardize
-            words = re.findall(r'\w+', text.upper())
-
-            # Create a Counter to count occurrences of each word, excluding stop words
-            word_counts = Counter(word for word in words if word not in self.parent_wiki_api.stop_words)
-
-            # Return sorted dictionary of words by decreasing frequency
-            self.word_frequency = dict(sorted(word_counts.items(), key=lambda item: item[1], reverse=True))
+            # Count uppercased words as the tokenizer finds them, excluding stop words
+            weight = word_uniqueness_weight if self.parent_wiki_api.adjust_for_word_uniqueness else None
+            self.word_frequency = count_words(text, self.parent_wiki_api.stop_words, top_k, weight=weight)
             return self.word_frequency
 
-    def __init__(self, src, tgt, word_uniqueness=True, neighbors_checked=5, use_bfs=False):
-        # Initialize the Wikipedia API
-        self.wiki = wikipediaapi.Wikipedia('DSA_Project3', 'en')
+    def __init__(self, src, tgt, word_uniqueness=True, neighbors_checked=5, use_bfs=False,
+                 page_source: Optional[PageSource] = None, page_cache: Optional[PageCache] = None,
+                 prefetch_depth=4, prefetch_workers=4, search_mode: Optional[str] = None,
+                 async_concurrency=8, requests_per_second=10.0, api_url: Optional[str] = None, batch_size=50,
+                 target_profile: Optional[TargetProfile] = None, profile_cache: Optional[TargetProfileCache] = None,
+                 astar_weight=2.0, beam_width=10, resolve_titles=True, verbose=True,
+                 frontier_capacity: Optional[int] = None, target_word_limit: Optional[int] = None,
+                 scorer: Optional[LinkScorer] = None):
+        # Where pages are read from, the live Wikipedia API unless a local store or other source is given
+        self.page_source = page_source if page_source is not None else WikipediaPageSource()
+        # Cache in front of the page source, shared by every instance unless one is given
+        self.page_cache = (page_cache if page_cache is not None
+                           else get_shared_page_cache(self.page_source.persistent_cache))
+        # Maps link titles to canonical titles (redirects followed) before they are queued, so an article reached
+        # under several names is visited once, and remembers pages that do not exist so they are never fetched again
+        self.title_resolver = TitleResolver(self.page_source, self.page_cache)
+        self.resolve_titles = resolve_titles
+        # Limits of the running search (unbounded unless search() is given some), page source requests it has
+        # issued, which limit stopped it, and the best scored (score, page, parent) seen in case it stops early
+        self.budget = SearchBudget()
+        self.requests_issued = 0
+        # Prefetcher threads count their requests too
+        self.requests_lock = threading.Lock()
+        self.stop_reason = None
+        self.best_candidate = None
+        # Pages exact search visited in its bitsets, which never enter the visited index
+        self.bitset_pages_visited = 0
         # List of common stop words to exclude
-        self.stop_words = {'WAS', 'MUCH', 'WERE', 'AN', 'S', 'WHEN', 'HAD', 'BUT',
-                           'IT', 'IS', 'A', 'ON', 'WHAT', 'CAN', 'HAVE', 'SHALL', 'OUT',
-                           'THAN', 'BE', 'WITH', 'OF', 'DO', 'MAY', 'DOES', 'OUGHT', 'FOR',
-                           'IN', 'MIGHT', 'WHO', 'WILL', 'THIS', 'ITS', 'WHICH', 'DOWN', 'BEING',
-                           'MANY', 'WOULD', 'FROM', 'ABOUT', 'AS', 'COULD', 'BEEN', 'THAT',
-                           'MUST', 'OR', 'SUCH', 'UP', 'HAS', 'BY', 'AND', 'DID', 'TO', 'THE',
-                           'SHOULD', 'ARE', 'ALSO', 'AT'}
+        self.stop_words = set(STOP_WORDS)
+        # Print every expanded page and its best links while searching
+        self.verbose = verbose
+        # Ranks the links of every expanded page, by relation score unless another scorer is given
+        self.scorer = scorer if scorer is not None else RelationScorer(self.stop_words)
         # Attributes to be modified by user
         self.adjust_for_word_uniqueness = word_uniqueness
         self.neighbors_to_check = neighbors_checked
+        # Beam search keeps only the beam_width best pages of each depth level
+        self.beam_width = beam_width
+        # Target and source profiles keep only the target_word_limit words of their page that weigh most (None for all)
+        self.target_word_limit = target_word_limit
+        # BFS and greedy search queue at most frontier_capacity pages, dropping the ones they would expand last
+        # (None for no limit)
+        self.frontier_capacity = frontier_capacity
         self.use_bfs = use_bfs
+        # One of SEARCH_MODES, chosen from use_bfs when not given
+        self.search_mode = search_mode
+        # How strongly A* trusts the relation score over path length (1 is plain A*, larger is greedier)
+        self.astar_weight = astar_weight
+        # Greedy search fetches the links of the top prefetch_depth heap entries in the background (0 disables)
+        self.prefetch_depth = prefetch_depth
+        self.prefetch_workers = prefetch_workers
+        # Async BFS keeps at most async_concurrency requests in flight at requests_per_second, against api_url
+        # (the Wikipedia endpoint of the page source when not given)
+        self.async_concurrency = async_concurrency
+        self.requests_per_second = requests_per_second
+        self.api_url = api_url
+        # BFS and greedy search ask for the links of up to batch_size queued pages in one request (1 disables)
+        self.batch_size = batch_size
+        # Links fetched in a batch ahead of the pages being expanded, title -> links (None if missing)
+        self.pending_links = {}
         # Store source and target WikiPage objects
         self.source_page_obj = WikiApi.WikiPage(self, src)
         self.target_page_obj = WikiApi.WikiPage(self, tgt)
-        self.target_page_obj.get_word_frequency()
-        # Store adjacency list and set of all visited notes for output later
+        # Word counts and weights of the target, shared with every search to the same target and settings so only
+        # the first one fetches and tokenizes the target page. A profile built elsewhere can be passed in
+        self.profile_cache = profile_cache if profile_cache is not None else get_shared_profile_cache()
+        self.target_profile = target_profile
+        if target_profile is not None:
+            self.profile_cache.put(self.page_source.name, target_profile)
+        self.get_target_profile()
+        # Store adjacency list and index of all visited pages (title -> parent and depth) for output later
         self.adjacency_list = {}
-        self.set_of_all_visited_sites = set()
+        self.visited = VisitedIndex()
+        # Pages reached backwards from the target by bidirectional search, title -> next page towards the target
+        self.backward_visited = VisitedIndex()
+
+    # Returns list of titles a page links to (None if it does not exist), checking the page cache first
+    def fetch_links(self, page_title) -> Optional[list[str]]:
+        # Links that came in with an earlier batch are used once and dropped
+        if page_title in self.pending_links:
+            return self.pending_links.pop(page_title)
+        links = self.page_cache.get(self.page_source.name + "/links", page_title)
+        if links is None:
+            if self.title_resolver.is_missing(page_title):
+                return None
+            self.add_requests(1)
+            links = self.page_source.get_links(page_title)
+            if links is not None:
+                self.page_cache.put(self.page_source.name + "/links", page_title, links)
+            else:
+                self.title_resolver.remember(page_title, None)
+        return links
+
+    # Returns dictionary of title -> links (None if it does not exist) for several pages. Cache misses are asked for
+    # together so page sources that support it answer them in a handful of multi-title requests
+    def fetch_links_many(self, page_titles) -> dict[str, Optional[list[str]]]:
+        kind = self.page_source.name + "/links"
+        results = {}
+        misses = []
+        for page_title in page_titles:
+            links = self.page_cache.get(kind, page_title)
+            if links is not None:
+                results[page_title] = links
+            elif self.title_resolver.is_missing(page_title):
+                results[page_title] = None
+            else:
+                misses.append(page_title)
+        if misses:
+            fetched = self.call_page_source(self.page_source.get_links_many, misses,
+                                            math.ceil(len(misses) / MAX_TITLES_PER_QUERY))
+            for page_title, links in fetched.items():
+                if links is not None:
+                    self.page_cache.put(kind, page_title, links)
+                else:
+                    self.title_resolver.remember(page_title, None)
+                results[page_title] = links
+        return results
+
+    # Adds requests made for the running search to its count, from any thread
+    def add_requests(self, count) -> None:
+        with self.requests_lock:
+            self.requests_issued += count
+
+    # Calls a page source method and adds the requests it made to the count. Continuations make some calls cost more
+    # than one request; sources that count their requests say how many, for others the estimate is used
+    def call_page_source(self, method, argument, estimate=1):
+        requests_before = self.page_source.get_thread_requests()
+        if requests_before is None:
+            self.add_requests(estimate)
+            return method(argument)
+        try:
+            return method(argument)
+        finally:
+            self.add_requests(self.page_source.get_thread_requests() - requests_before)
+
+    # Fetches links for a group of pages that are about to be expanded and holds them until fetch_links asks. n is
+    # how many links each page keeps when expanded, see resolve_links_ahead
+    def batch_fetch_links(self, page_titles, n: Optional[int] = None) -> None:
+        page_titles = [page_title for page_title in dict.fromkeys(page_titles) if page_title not in self.pending_links]
+        if page_titles:
+            fetched = self.fetch_links_many(page_titles)
+            self.pending_links.update(fetched)
+            self.resolve_links_ahead(fetched, n)
+
+    # Resolves the links several pages will keep when expanded (their n best, neighbors_to_check unless given) to
+    # canonical titles in one go, so canonicalize_links finds them resolved and a group of pages costs a resolution
+    # request per MAX_TITLES_PER_QUERY links instead of one per page. Takes title -> links (None if missing)
+    def resolve_links_ahead(self, page_links: dict[str, Optional[list[str]]], n: Optional[int] = None) -> None:
+        if not self.resolve_titles or not self.page_source.has_redirects:
+            return
+        profile = self.get_target_profile()
+        n = n if n is not None else self.neighbors_to_check
+        candidates = [page for links in page_links.values() if links is not None
+                      for page in self.rank_titles(links, profile, n)]
+        if candidates:
+            self.resolve_canonical_titles(candidates)
+
+    # Returns list of titles of pages linking to a page (None if it does not exist), checking the page cache first
+    def fetch_backlinks(self, page_title) -> Optional[list[str]]:
+        backlinks = self.page_cache.get(self.page_source.name + "/backlinks", page_title)
+        if backlinks is None:
+            backlinks = self.call_page_source(self.page_source.get_backlinks, page_title)
+            if backlinks is not None:
+                self.page_cache.put(self.page_source.name + "/backlinks", page_title, backlinks)
+        return backlinks
+
+    # Returns list of titles redirecting to a page, checking the page cache first
+    def fetch_redirects(self, page_title) -> list[str]:
+        redirects = self.page_cache.get(self.page_source.name + "/redirects", page_title)
+        if redirects is None:
+            redirects = self.call_page_source(self.page_source.get_redirects, page_title)
+            self.page_cache.put(self.page_source.name + "/redirects", page_title, redirects)
+        return redirects
+
+    # Returns text body of a page (None if it does not exist), checking the page cache first
+    def fetch_text(self, page_title) -> Optional[str]:
+        text = self.page_cache.get(self.page_source.name + "/text", page_title)
+        if text is None:
+            self.add_requests(1)
+            text = self.page_source.get_text(page_title)
+            if text is not None:
+                self.page_cache.put(self.page_source.name + "/text", page_title, text)
+        return text
 
     # Sets starting page
     def set_source_page(self, src):
@@ -101,6 +268,8 @@ class WikiApi:
     def set_target_page(self, trg):
         del self.target_page_obj
         self.target_page_obj = WikiApi.WikiPage(self, trg)
+        self.target_profile = None
+        self.get_target_profile()
 
     # Changes the setting for accounting for word uniqueness
     def reverse_adjust_for_word_uniqueness(self):
@@ -112,6 +281,78 @@ class WikiApi:
         # Since an average page has 200 out links, we only consider n most relevant ones
         self.neighbors_to_check = int(n)
 
+    # Sets how many of the best unexplored pages greedy search prefetches links for
+    def set_prefetch_depth(self, k):
+        self.prefetch_depth = int(k)
+
+    # Sets the heuristic weight w of A* search, priority = depth + w * h
+    def set_astar_weight(self, w):
+        self.astar_weight = float(w)
+
+    # Returns the heuristic weight of A* search
+    def get_astar_weight(self) -> float:
+        return self.astar_weight
+
+    # Sets how many queued pages are fetched together in one batch
+    def set_batch_size(self, n):
+        self.batch_size = max(1, int(n))
+
+    # Sets how many threads prefetch links
+    def set_prefetch_workers(self, n):
+        self.prefetch_workers = max(1, int(n))
+
+    # Sets which search algorithm search() runs, one of SEARCH_MODES
+    def set_search_mode(self, mode):
+        if mode not in WikiApi.SEARCH_MODES:
+            raise ValueError(f"Unknown search mode '{mode}', expected one of {WikiApi.SEARCH_MODES}")
+        self.search_mode = mode
+
+    # Returns the search algorithm search() runs
+    def get_search_mode(self) -> str:
+        if self.search_mode is not None:
+            return self.search_mode
+        return "bfs" if self.use_bfs else "greedy"
+
+    # Returns the profile of the target page under the current uniqueness setting, from the profile cache when the
+    # same target was profiled before
+    def get_target_profile(self) -> TargetProfile:
+        profile = self.target_profile
+        if (profile is None or profile.adjust_for_word_uniqueness != self.adjust_for_word_uniqueness
+                or profile.word_limit != self.target_word_limit
+                or title_key(profile.title) != title_key(self.target_page_obj.title)):
+            profile = self.profile_cache.get(self.page_source.name, self.target_page_obj.title,
+                                             self.adjust_for_word_uniqueness, self.load_target_word_frequency,
+                                             self.load_target_redirects, self.target_word_limit)
+            self.target_profile = profile
+        self.target_page_obj.word_frequency = profile.word_frequency
+        return profile
+
+    # Fetches and counts the words of the target page, empty if it does not exist
+    def load_target_word_frequency(self) -> dict[str, int]:
+        word_frequency = self.target_page_obj.get_word_frequency(self.target_word_limit)
+        return {} if word_frequency == "Page not found" else word_frequency
+
+    # Fetches the titles that redirect to the target, so links to them count as reaching it
+    def load_target_redirects(self) -> list[str]:
+        return self.fetch_redirects(self.target_page_obj.title)
+
+    # Returns a profile of the source page, used to rank backlinks by how related they are to the source
+    def get_source_profile(self) -> TargetProfile:
+        def load_source_word_frequency():
+            word_frequency = self.source_page_obj.get_word_frequency(self.target_word_limit)
+            return {} if word_frequency == "Page not found" else word_frequency
+        return self.profile_cache.get(self.page_source.name, self.source_page_obj.title,
+                                      self.adjust_for_word_uniqueness, load_source_word_frequency,
+                                      word_limit=self.target_word_limit)
+
+    # Returns the word -> weight table for the target page under the current uniqueness setting
+    def get_word_weights(self) -> dict[str, float]:
+        return self.get_target_profile().weights
+
+    # Returns the weight table as a WeightVocabulary for scoring many titles at once
+    def get_word_vocabulary(self) -> WeightVocabulary:
+        return self.get_target_profile().vocabulary
+
     # Returns bool for current setting of word uniqueness
     def get_adjust_for_word_uniqueness(self):
         return self.adjust_for_word_uniqueness
@@ -120,85 +361,144 @@ class WikiApi:
     def get_neighbors_to_check(self):
         return self.neighbors_to_check
 
+    # Sets how many pages per depth level beam search keeps
+    def set_beam_width(self, b):
+        self.beam_width = max(1, int(b))
+
+    # Returns how many pages per depth level beam search keeps
+    def get_beam_width(self) -> int:
+        return self.beam_width
+
     # Returns dictionary of pages from path found and titles they link to
     def get_adjacency_list(self):
         return self.adjacency_list
 
-    # Returns list of strings of titles of all visited sites
+    # Returns list of strings of titles of all visited sites, including those reached backwards from the target
     def get_names_of_all_visited_sites(self):
-        return [page.title for page in self.set_of_all_visited_sites]
+        return list(self.visited) + [title for title in self.backward_visited if title not in self.visited]
 
-    # Returns size of visited sites set
+    # Returns size of visited sites index
     def get_number_of_visited_sites(self) -> int:
-        return len(self.set_of_all_visited_sites)
+        return (len(self.visited) + sum(1 for title in self.backward_visited if title not in self.visited)
+                + self.bitset_pages_visited)
+
+    # Forgets the results of the previous search
+    def reset_search_state(self) -> None:
+        self.adjacency_list.clear()
+        self.visited.clear()
+        self.backward_visited.clear()
+        self.pending_links.clear()
+        self.requests_issued = 0
+        self.stop_reason = None
+        self.best_candidate = None
+        self.bitset_pages_visited = 0
+
+    # Returns True once the search budget has run out, remembering which limit it was
+    def budget_exhausted(self) -> bool:
+        self.stop_reason = self.budget.exhausted(len(self.visited) + len(self.backward_visited)
+                                                 + self.bitset_pages_visited, self.requests_issued)
+        return self.stop_reason is not None
+
+    # Message returned by a search method that stopped because its budget ran out
+    def budget_exhausted_message(self) -> str:
+        return f"Search stopped early ({self.stop_reason}) before reaching '{self.target_page_obj.title}'"
+
+    # Keeps track of the best scored link seen so far, so a search cut short can return its chain
+    def note_candidates(self, current_page, related_links: dict[str, float]) -> None:
+        for page, similarity_index in related_links.items():
+            if self.best_candidate is None or similarity_index > self.best_candidate[0]:
+                self.best_candidate = (similarity_index, page, current_page)
+
+    # Returns the link reaching the target (the target itself or one of its redirects), None if no link does. Every
+    # link of the page is tested, not only the best scored ones, with one set lookup per link
+    def find_target_link(self, links) -> Optional[str]:
+        target_titles = self.get_target_profile().titles
+        for link in links:
+            if title_key(link) in target_titles:
+                return link
+        return None
+
+    # Adds the target to the adjacency list and visited index as reached from a page, and returns the found message. A
+    # target visited already keeps its parent, re-parenting it under one of its descendants would make a cycle
+    def reach_target(self, current_page) -> str:
+        target_title = self.target_page_obj.title
+        if target_title not in self.visited:
+            self.visited.add(target_title, current_page)
+            self.adjacency_list[current_page].append(target_title)
+        self.adjacency_list.setdefault(target_title, [])
+        self.target_page_obj.set_parent(self.visited.get(target_title).parent)
+        return f"Target page '{target_title}' found starting from '{self.source_page_obj.title}'"
+
+    # Called by a search as it starts. When the source is the target (or redirects to it) records the path to it and
+    # returns the found message, otherwise returns None
+    def start_at_target(self) -> Optional[str]:
+        source_title = self.source_page_obj.title
+        if not self.get_target_profile().is_target(source_title):
+            return None
+        self.visited.add(source_title)
+        self.adjacency_list[source_title] = []
+        if self.target_page_obj.title != source_title:
+            return self.reach_target(source_title)
+        self.target_page_obj.set_parent("")
+        return f"Target page '{source_title}' found starting from '{source_title}'"
 
     # Returns length of path after a search
     def get_length_of_path(self) -> int:
         path = self.trace_path_backwards()
-        if path is not None: return len(self.trace_path_backwards()) - 1
+        if path is not None: return len(path) - 1
         return 0
 
-    # Returns WikiPage object with a given title, used in trace_path_backwards()
-    # and search methods
-    def get_object_matching_page_title(self, page_title):
-        for page_obj in self.set_of_all_visited_sites:
-            if page_obj.title == page_title: return page_obj
-        return None
+    # Returns the visit record (title, parent and depth) of a visited page with a given title, None if not visited
+    def get_object_matching_page_title(self, page_title) -> Optional[VisitRecord]:
+        return self.visited.get(page_title)
 
     # Returns n number of links out of a current page with the highest relation score. To find the relation score of
     # a link, the following is done: For each word in the title of the link, the log of the word frequency in the
     # english language is taken (This is done wo that long unique words don't have a crazy effect) then multiplied by
     # how frequent it is in the target page. The scores for each word in the link title are added up and divided by
     # the number of words in the title to take the average (stop words aren't counted). This is the relation score
-    # used to rank links.
-    def get_most_similar_links_to_target(self, current_page):
+    # used to rank links by default, another scorer can be plugged in instead (see scorers.py).
+    def get_most_similar_links_to_target(self, current_page, current_links=None):
         # List to store titles that contain any word found in the target page's word frequency list
         links_and_indices = {}
-        current_links = self.target_page_obj.get_page_links(current_page)
-        target_words = self.target_page_obj.word_frequency
-
-        # Anonymous function
-        split = lambda title: [word for word in title.split() if word not in self.stop_words]
-
-        # Retrieves linked titles from the current page and splits each title into words
-        title_words = {title: split(title.upper()) for title in current_links}
-        # Iterates over each title and its words
-        for title, words in title_words.items():
-            # Check if any word in the title is in the target page's frequency dictionary
-            total_freq = 0
-            for word in words:
-                if word in target_words.keys():
-                    # Add word times its uniqueness weight
-                    word_uniqueness = wordfreq.word_frequency(word, "en")
-                    # Word uniqueness method as determined through experimentation
-                    if word_uniqueness <= 0: word_uniqueness_weight = lambda word: 10
-                    else: word_uniqueness_weight = lambda word: -1 * math.log10(word_uniqueness) - 1
-                    # Remove effect of function if adjust_for_word_uniqueness not True
-                    if not self.adjust_for_word_uniqueness: word_uniqueness_weight = lambda word: 1
-                    total_freq += target_words[word] * word_uniqueness_weight(word)
-            try:
-                total_freq /= len(words)
-            except:
-                total_freq = 0
-            links_and_indices[title] = total_freq
+        # Links may already have been fetched, e.g. by the prefetcher
+        if current_links is None:
+            current_links = self.target_page_obj.get_page_links(current_page)
+        if current_links == "Page not found":
+            return links_and_indices
+        links_and_indices = self.rank_titles(current_links, self.get_target_profile(), self.neighbors_to_check)
+        links_and_indices = self.canonicalize_links(links_and_indices)
+        self.note_candidates(current_page, links_and_indices)
+        return links_and_indices
+
+    # Renames ranked links to their canonical titles, dropping links to pages that do not exist. Links that turn out
+    # to be the same article keep the best score
+    def canonicalize_links(self, related_links: dict[str, float]) -> dict[str, float]:
+        if not self.resolve_titles or not related_links:
+            return related_links
+        canonical_titles = self.resolve_canonical_titles(related_links)
+        canonical_links = {}
+        for page, similarity_index in related_links.items():
+            canonical = canonical_titles[page]
+            if canonical is not None and similarity_index > canonical_links.get(canonical, -math.inf):
+                canonical_links[canonical] = similarity_index
+        return canonical_links
 
-        # Return subset of links and their similarity indices, sorted by decreasing index
-        links_and_indices = dict(sorted(links_and_indices.items(), key=lambda item: item[1], reverse=True))
-        return {x: links_and_indices[x] for x in list(links_and_indices)[:self.neighbors_to_check]}
+    # Returns title -> canonical title (None if the page does not exist), adding the requests made to the count
+    def resolve_canonical_titles(self, page_titles) -> dict[str, Optional[str]]:
+        requests_before = self.title_resolver.requests
+        canonical_titles = self.title_resolver.resolve_many(page_titles)
+        self.add_requests(self.title_resolver.requests - requests_before)
+        return canonical_titles
+
+    # Returns the n titles with the highest score to a profile and their scores, best first, all scored in one batch
+    def rank_titles(self, titles, profile: TargetProfile, n) -> dict[str, float]:
+        return self.scorer.top_n(titles, profile, n)
 
     # Returns the path taken to get to target
     def trace_path_backwards(self) -> Optional[list[str]]:
-        if self.target_page_obj not in self.set_of_all_visited_sites: return None
-        current_page_obj = self.target_page_obj
-        path = []
-        # Iterates through objects and their parents until the entire path is reached
-        while current_page_obj.parent != self.source_page_obj.title:
-            path.append(current_page_obj.title)
-            current_page_obj = self.get_object_matching_page_title(current_page_obj.parent)
-        path.append(current_page_obj.title)
-        path.append(self.source_page_obj.title)
-        path.reverse()
-        return path
+        # Follows parent pointers from the target back to the source, one lookup per step
+        return self.visited.path_to(self.target_page_obj.title)
 
 # Used for information-gathering
     def print_summary(self):
@@ -216,51 +516,58 @@ class WikiApi:
 
     # Modified BFS which only ads N most similar neighbors to the queue. Since an average page links to 200 others
     # and some pages are 6 or more connections apart, pure BFS would require an unfeasible number of steps (>200^6).
-    def bfs_search(self):
+    def bfs_events(self):
         queue = deque([(self.source_page_obj.title, "")])  # Queue to manage the frontier pages
-        self.adjacency_list.clear()
-        self.set_of_all_visited_sites.clear()
+        # Pages queued so far, so a page linked from several expanded pages is queued once
+        queued = {self.source_page_obj.title}
+        self.reset_search_state()
+        message = self.start_at_target()
+        if message is not None:
+            return message
 
         while queue:
+            if self.budget_exhausted():
+                return self.budget_exhausted_message()
             # Store page and its parent in a queue to use for object creation
             current_page, current_page_parent = queue.popleft()
 
             # Skip revisiting pages
-            if (current_page_parent != "" and self.get_object_matching_page_title(current_page)
-                    in self.set_of_all_visited_sites):
+            if current_page in self.visited:
                 continue
-            # Make an object for a page if its actually visited
-            current_page_obj = WikiApi.WikiPage(self, current_page)
-            current_page_obj.set_parent(current_page_parent)
-            self.set_of_all_visited_sites.add(current_page_obj)
+            # Record the page and its parent now that it is actually visited
+            self.visited.add(current_page, current_page_parent)
 
             # Insert the page to the adjacency list dict and its parent's value
             if current_page_parent != "":
                 self.adjacency_list[current_page_parent].append(current_page)
             if current_page not in self.adjacency_list.keys():
                 self.adjacency_list[current_page] = []
+            yield self.make_event(EXPANDED, current_page, current_page_parent)
 
             # Get the top similar linked pages from the current page
             try:
-                related_links = self.get_most_similar_links_to_target(current_page)
+                # Fetch this page together with the next unvisited pages in the queue
+                if self.batch_size > 1 and current_page not in self.pending_links:
+                    upcoming = [page for page, _ in islice(queue, self.batch_size * 2) if page not in self.visited]
+                    self.batch_fetch_links([current_page] + upcoming[:self.batch_size - 1])
+                current_links = self.target_page_obj.get_page_links(current_page)
+                # If any link reaches the target, stop here
+                if current_links != "Page not found" and self.find_target_link(current_links) is not None:
+                    return self.reach_target(current_page)
+                related_links = self.get_most_similar_links_to_target(current_page, current_links)
                 # Print site and links for debugging
-                print(str(current_page) + " links to " + str(related_links))
-                # If target found in list of links
-                if self.target_page_obj.title.upper() in [word.upper() for word in related_links.keys()]:
-                    # Add target object to adjacency list and set and return
-                    self.target_page_obj.set_parent(current_page)
-                    self.set_of_all_visited_sites.add(self.target_page_obj)
-                    self.adjacency_list[current_page].append(self.target_page_obj.title)
-                    self.adjacency_list[self.target_page_obj.title] = []
-                    return f"Target page '{self.target_page_obj.title}' found starting from '{self.source_page_obj.title}'"
+                if self.verbose: print(str(current_page) + " links to " + str(related_links))
+                yield self.make_event(SCORED, current_page, candidates=related_links)
 
             except Exception as e:
                 print(f"Failed to retrieve or process links for {current_page}: {e}")
                 continue
 
-            # Enqueue unvisited linked pages
+            # Enqueue linked pages not queued yet. A full queue drops new pages, which are the ones BFS would
+            # expand last
             for page in related_links.keys():
-                if self.get_object_matching_page_title(page) not in self.set_of_all_visited_sites:
+                if page not in queued and (self.frontier_capacity is None or len(queue) < self.frontier_capacity):
+                    queued.add(page)
                     queue.append((page, current_page))
 
         return "Target page not found within the connected pages."
@@ -268,65 +575,596 @@ class WikiApi:
     # Greedy Search makes a min heap (values are negated so technically max heap) of N unexplored but reachable pages
     # based on their similarity index. At each step, Greedy Search explores the highest rated page. Where N is
     # determined by the user in "Search Breadth"
-    def greedy_search(self):
-        priority_queue = []
-        # Min heap representing our nodes to visit. Similarity indices will be inserted as
-        # negative values so the min heap returns the values with actually the most similarity
-        heapq.heappush(priority_queue, (0, (self.source_page_obj.title, "")))
-        self.adjacency_list.clear()
-        self.set_of_all_visited_sites.clear()
+    def greedy_events(self):
+        # Min heap representing our nodes to visit, holding at most frontier_capacity of them. Similarity indices will
+        # be inserted as negative values so the min heap returns the values with actually the most similarity
+        priority_queue = BoundedPriorityQueue(self.frontier_capacity)
+        priority_queue.push(0, (self.source_page_obj.title, ""))
+        # Pages in the queue or already taken out of it, so a page linked from several expanded pages is queued once
+        queued = {self.source_page_obj.title}
+        # Prefetched pages whose best links were already resolved along with an earlier page's
+        resolved_ahead = set()
+        self.reset_search_state()
+        message = self.start_at_target()
+        if message is not None:
+            return message
+        # Thread pool downloading links of the pages most likely to be expanded next, in one batch when enabled
+        prefetcher = (LinkPrefetcher(self.fetch_links, self.prefetch_workers,
+                                     self.fetch_links_many if self.batch_size > 1 else None)
+                      if self.prefetch_depth > 0 else None)
+        try:
+            while priority_queue:
+                if self.budget_exhausted():
+                    return self.budget_exhausted_message()
+                # Store page and its parent in the PQ to use for object creation
+                priority, (current_page, current_page_parent) = priority_queue.pop()
+
+                # Skip revisiting pages
+                if current_page in self.visited:
+                    continue
+
+                # Record the page, its parent and the score it was picked with now that it is actually visited
+                self.visited.add(current_page, current_page_parent, -priority)
+
+                # Insert the page to the adjacency list dict and its parent's value
+                if current_page_parent != "":
+                    self.adjacency_list[current_page_parent].append(current_page)
+                if current_page not in self.adjacency_list.keys():
+                    self.adjacency_list[current_page] = []
+                yield self.make_event(EXPANDED, current_page, current_page_parent)
+
+                # Get the top similar linked pages from the current page
+                try:
+                    # While this page is fetched, start on the unvisited pages at the top of the heap. Without a
+                    # prefetcher they are instead fetched in the same batch as this page
+                    lookahead = self.prefetch_depth if prefetcher is not None else self.batch_size - 1
+                    if lookahead > 0 and current_page not in self.pending_links:
+                        upcoming = [page for page, _ in priority_queue.peek(lookahead * 2)
+                                    if page not in self.visited and page != current_page]
+                        if prefetcher is not None:
+                            prefetcher.prefetch([current_page] + upcoming[:lookahead])
+                        else:
+                            self.batch_fetch_links([current_page] + upcoming[:lookahead])
+                    if prefetcher is not None:
+                        current_links = prefetcher.get(current_page)
+                        # Resolve this page's best links along with those of the pages already prefetched
+                        ready = {page: links for page, links in prefetcher.get_ready().items()
+                                 if page not in resolved_ahead}
+                        resolved_ahead.update(ready)
+                        self.resolve_links_ahead({current_page: current_links, **ready})
+                        if current_links is None:
+                            current_links = "Page not found"
+                    else:
+                        current_links = self.target_page_obj.get_page_links(current_page)
+                    # If any link reaches the target, stop here
+                    if current_links != "Page not found" and self.find_target_link(current_links) is not None:
+                        return self.reach_target(current_page)
+                    related_links = self.get_most_similar_links_to_target(current_page, current_links)
+                    # Print site and links for debugging
+                    if self.verbose: print(str(current_page) + " links to " + str(related_links))
+                    yield self.make_event(SCORED, current_page, candidates=related_links)
+
+                except Exception as e:
+                    print(f"Failed to retrieve or process links for {current_page}: {e}")
+                    continue
+
+                # Enqueue linked pages not queued yet
+                for page, similarity_index in related_links.items():
+                    if page not in queued:
+                        queued.add(page)
+                        # Negate similarity index to use min heap as a max heap
+                        evicted = priority_queue.push(-1 * similarity_index, (page, current_page))
+                        # A page dropped from a full queue may be queued again if it is reached later
+                        if evicted is not None:
+                            queued.discard(evicted[0])
+
+            return "Target page not found within the connected pages."
+        finally:
+            if prefetcher is not None:
+                prefetcher.shutdown()
+
+    # Level synchronous BFS: every page at the current depth is independent, so the links of the whole frontier level
+    # are fetched concurrently before any of them is scored. Pruning to the N best links is the same as bfs_search
+    def async_bfs_events(self):
+        # Imported here so aiohttp is only needed when this mode is used
+        from .asyncclient import AsyncMediaWikiClient
+        frontier = [(self.source_page_obj.title, "")]
+        self.reset_search_state()
+        message = self.start_at_target()
+        if message is not None:
+            return message
+        # Pages from Wikipedia go over the pooled async session, other page sources are read on worker threads
+        api_url = self.api_url or getattr(self.page_source, "api_url", None)
+        user_agent = getattr(self.page_source, "user_agent", 'DSA_Project3')
+        # The search yields events between levels, so it drives its own event loop one level fetch at a time
+        loop = asyncio.new_event_loop()
+        client = (AsyncMediaWikiClient(api_url, user_agent, self.async_concurrency, self.requests_per_second)
+                  if api_url is not None else contextlib.nullcontext())
+
+        async def fetch(page_title):
+            links = self.page_cache.get(self.page_source.name + "/links", page_title)
+            if links is not None:
+                return links
+            # Pages known not to exist are never asked for again
+            if self.title_resolver.is_missing(page_title):
+                return "Page not found"
+            if api_url is None:
+                self.add_requests(1)
+                links = await asyncio.to_thread(self.page_source.get_links, page_title)
+            else:
+                links = await client.get_links(page_title)
+            if links is None:
+                self.title_resolver.remember(page_title, None)
+                return "Page not found"
+            self.page_cache.put(self.page_source.name + "/links", page_title, links)
+            return links
+
+        async def fetch_level(level):
+            return await asyncio.gather(*(fetch(page) for page in level), return_exceptions=True)
+
+        try:
+            loop.run_until_complete(client.__aenter__())
+            try:
+                while frontier:
+                    # Visit every new page of this level, keeping the first parent a page was reached from
+                    level = []
+                    for current_page, current_page_parent in frontier:
+                        if self.budget_exhausted():
+                            break
+                        if current_page in self.visited:
+                            continue
+                        self.visited.add(current_page, current_page_parent)
+                        if current_page_parent != "":
+                            self.adjacency_list[current_page_parent].append(current_page)
+                        if current_page not in self.adjacency_list.keys():
+                            self.adjacency_list[current_page] = []
+                        yield self.make_event(EXPANDED, current_page, current_page_parent)
+                        level.append(current_page)
+                    if self.stop_reason is not None:
+                        return self.budget_exhausted_message()
+
+                    # Fetch the whole level at once. Client requests are counted around the whole level, the
+                    # coroutines run at the same time so a difference taken inside one would include the others'
+                    requests_before = client.requests if api_url is not None else 0
+                    level_links = loop.run_until_complete(fetch_level(level))
+                    if api_url is not None:
+                        self.add_requests(client.requests - requests_before)
+                    self.resolve_links_ahead({page: links for page, links in zip(level, level_links)
+                                              if isinstance(links, list)})
+
+                    frontier = []
+                    for current_page, current_links in zip(level, level_links):
+                        if isinstance(current_links, Exception):
+                            print(f"Failed to retrieve or process links for {current_page}: {current_links}")
+                            continue
+                        # If any link reaches the target, stop here
+                        if current_links != "Page not found" and self.find_target_link(current_links) is not None:
+                            return self.reach_target(current_page)
+                        related_links = self.get_most_similar_links_to_target(current_page, current_links)
+                        # Print site and links for debugging
+                        if self.verbose: print(str(current_page) + " links to " + str(related_links))
+                        yield self.make_event(SCORED, current_page, candidates=related_links)
+                        # Queue unvisited linked pages for the next level
+                        for page in related_links.keys():
+                            if page not in self.visited:
+                                frontier.append((page, current_page))
+            finally:
+                loop.run_until_complete(client.__aexit__(None, None, None))
+        finally:
+            loop.close()
+
+        return "Target page not found within the connected pages."
+
+    # Estimated number of links still to follow from a page with the given relation score. Any page other than the
+    # target is at least one link away; the better its score, the closer that estimate gets to exactly one
+    @staticmethod
+    def relation_heuristic(similarity_index) -> float:
+        return 1 + 1 / (1 + max(similarity_index, 0))
+
+    # A* search orders the heap by depth + w * h(page), where h comes from the relation score the page got when its
+    # parent was expanded. Path length keeps it from wandering down long chains like greedy search does, and a page
+    # reached again through a shorter path is reopened with its new parent
+    def astar_events(self):
+        self.reset_search_state()
+        message = self.start_at_target()
+        if message is not None:
+            return message
+        # Entries are (priority, insertion order, page, parent, depth), the insertion order breaks ties
+        priority_queue = [(0, 0, self.source_page_obj.title, "", 0)]
+        pushed = 1
+        # Shortest known depth of every page reached so far
+        best_depth = {self.source_page_obj.title: 0}
 
         while priority_queue:
-            # Store page and its parent in the PQ to use for object creation
-            current_page, current_page_parent = heapq.heappop(priority_queue)[1]
+            if self.budget_exhausted():
+                return self.budget_exhausted_message()
+            _, _, current_page, current_page_parent, depth = heapq.heappop(priority_queue)
 
-            # Skip revisiting pages
-            if (current_page_parent != "" and self.get_object_matching_page_title(current_page)
-                    in self.set_of_all_visited_sites):
+            # Skip entries made stale by a shorter path, and pages already expanded at this depth
+            if depth > best_depth[current_page]:
                 continue
-            # Make an object for a page if its actually visited
-            current_page_obj = WikiApi.WikiPage(self, current_page)
-            current_page_obj.set_parent(current_page_parent)
-            self.set_of_all_visited_sites.add(current_page_obj)
+            record = self.visited.get(current_page)
+            if record is not None and record.depth <= depth:
+                continue
+            # Record the page and its parent (again, if it was reopened through a shorter path)
+            self.visited.add(current_page, current_page_parent)
 
             # Insert the page to the adjacency list dict and its parent's value
-            if current_page_parent != "":
+            if current_page_parent != "" and current_page not in self.adjacency_list[current_page_parent]:
                 self.adjacency_list[current_page_parent].append(current_page)
             if current_page not in self.adjacency_list.keys():
                 self.adjacency_list[current_page] = []
+            yield self.make_event(EXPANDED, current_page, current_page_parent)
 
             # Get the top similar linked pages from the current page
             try:
-                related_links = self.get_most_similar_links_to_target(current_page)
+                # Fetch this page together with the best pages on the heap
+                if self.batch_size > 1 and current_page not in self.pending_links:
+                    upcoming = [entry[2] for entry in islice(iter_sorted(priority_queue), self.batch_size * 2)
+                                if entry[2] not in self.visited]
+                    self.batch_fetch_links([current_page] + upcoming[:self.batch_size - 1])
+                current_links = self.target_page_obj.get_page_links(current_page)
+                # If any link reaches the target, stop here
+                if current_links != "Page not found" and self.find_target_link(current_links) is not None:
+                    return self.reach_target(current_page)
+                related_links = self.get_most_similar_links_to_target(current_page, current_links)
                 # Print site and links for debugging
-                print(str(current_page) + " links to " + str(related_links))
-                # If target found in list of links
-                if self.target_page_obj.title.upper() in [word.upper() for word in related_links.keys()]:
-                    # Add target object to adjacency list and set and return
-                    self.target_page_obj.set_parent(current_page)
-                    self.set_of_all_visited_sites.add(self.target_page_obj)
-                    self.adjacency_list[current_page].append(self.target_page_obj.title)
-                    self.adjacency_list[self.target_page_obj.title] = []
-                    return f"Target page '{self.target_page_obj.title}' found starting from '{self.source_page_obj.title}'"
+                if self.verbose: print(str(current_page) + " links to " + str(related_links))
+                yield self.make_event(SCORED, current_page, candidates=related_links)
 
             except Exception as e:
                 print(f"Failed to retrieve or process links for {current_page}: {e}")
                 continue
 
-            # Enqueue unvisited linked pages
+            # Push linked pages not yet reached through a path this short
             for page, similarity_index in related_links.items():
-                if self.get_object_matching_page_title(page) not in self.set_of_all_visited_sites:
-                    # Negate similarity index to use min heap as a max heap
-                    heapq.heappush(priority_queue, (-1 * similarity_index, (page, current_page)))
+                if depth + 1 < best_depth.get(page, math.inf):
+                    best_depth[page] = depth + 1
+                    priority = depth + 1 + self.astar_weight * WikiApi.relation_heuristic(similarity_index)
+                    heapq.heappush(priority_queue, (priority, pushed, page, current_page, depth + 1))
+                    pushed += 1
 
         return "Target page not found within the connected pages."
 
-    # Determine what search to use
-    def search(self):
-        if self.use_bfs:
-            self.bfs_search()
-        else:
-            self.greedy_search()
+    # Beam search goes one depth level at a time but keeps only the beam_width best scoring links found anywhere on
+    # the level, instead of N links per page like BFS, so memory and fetches per level never exceed the beam width
+    def beam_events(self):
+        self.reset_search_state()
+        message = self.start_at_target()
+        if message is not None:
+            return message
+        level = [(self.source_page_obj.title, "", math.nan)]
+        target_profile = self.get_target_profile()
+
+        while level:
+            # Visit every page of the level
+            pages = []
+            for current_page, current_page_parent, score in level:
+                if self.budget_exhausted():
+                    return self.budget_exhausted_message()
+                if current_page in self.visited:
+                    continue
+                self.visited.add(current_page, current_page_parent, score)
+                if current_page_parent != "":
+                    self.adjacency_list[current_page_parent].append(current_page)
+                if current_page not in self.adjacency_list.keys():
+                    self.adjacency_list[current_page] = []
+                yield self.make_event(EXPANDED, current_page, current_page_parent)
+                pages.append(current_page)
+            self.batch_fetch_links(pages, self.beam_width)
+
+            # Min heap of the best (score, insertion order, page, parent) candidates for the next level, never larger
+            # than the beam width. The insertion order is negated so earlier links win ties
+            beam = []
+            in_beam = set()
+            order = 0
+            for current_page in pages:
+                try:
+                    current_links = self.fetch_links(current_page)
+                    if current_links is None:
+                        continue
+                    # If any link reaches the target, stop here
+                    if self.find_target_link(current_links) is not None:
+                        return self.reach_target(current_page)
+                    # No single page can put more than beam_width links into the beam
+                    related_links = self.canonicalize_links(self.rank_titles(current_links, target_profile,
+                                                                             self.beam_width))
+                    self.note_candidates(current_page, related_links)
+                    # Print site and links for debugging
+                    if self.verbose: print(str(current_page) + " links to " + str(related_links))
+                    yield self.make_event(SCORED, current_page, candidates=related_links)
+                except Exception as e:
+                    print(f"Failed to retrieve or process links for {current_page}: {e}")
+                    continue
+
+                for page, similarity_index in related_links.items():
+                    if page in self.visited or page in in_beam:
+                        continue
+                    entry = (similarity_index, -order, page, current_page)
+                    order += 1
+                    if len(beam) < self.beam_width:
+                        heapq.heappush(beam, entry)
+                        in_beam.add(page)
+                    elif entry > beam[0]:
+                        in_beam.discard(heapq.heapreplace(beam, entry)[2])
+                        in_beam.add(page)
+
+            # Expand the best candidates first on the next level
+            level = [(page, parent, score) for score, _, page, parent in sorted(beam, reverse=True)]
+
+        return "Target page not found within the connected pages."
+
+    # Bidirectional search expands forward from the source along links and backward from the target along backlinks,
+    # one whole level at a time, always on the side with the smaller frontier. Each side keeps the N best pages per
+    # expanded page (forward ranked against the target, backward against the source), but meeting is tested against
+    # every link, so the search stops as soon as any expanded page links into a page the other side has reached
+    def bidirectional_events(self):
+        self.reset_search_state()
+        source_title = self.source_page_obj.title
+        target_title = self.target_page_obj.title
+        self.visited.add(source_title)
+        self.backward_visited.add(target_title)
+        self.adjacency_list[source_title] = []
+        # Normalized title -> (title, parent) of every page reached on each side, so the meeting test ignores case and
+        # underscores. Pages only enter the visited indexes when they are expanded, or when the halves meet through them
+        forward_reached = {title_key(source_title): (source_title, "")}
+        backward_reached = {title_key(target_title): (target_title, "")}
+        # Links to a redirect of the target reach the target itself
+        for key in self.get_target_profile().titles:
+            backward_reached.setdefault(key, (target_title, ""))
+        forward_frontier = [(source_title, "")]
+        backward_frontier = [(target_title, "")]
+        source_profile = None
+        if title_key(source_title) in backward_reached:
+            self.join_search_halves(source_title, target_title)
+            return f"Target page '{target_title}' found starting from '{source_title}'"
+
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                next_frontier = []
+                for start in range(0, len(forward_frontier), max(1, self.batch_size)):
+                    if self.budget_exhausted():
+                        return self.budget_exhausted_message()
+                    # Fetch the level in batches, no larger than the pages the budget has left, so links are never
+                    # fetched for pages the search will not get to expand
+                    chunk = forward_frontier[start:start + max(1, self.batch_size)]
+                    if self.budget.max_pages is not None:
+                        pages_left = self.budget.max_pages - len(self.visited) - len(self.backward_visited)
+                        chunk = chunk[:max(1, pages_left)]
+                    self.batch_fetch_links([page for page, _ in chunk])
+                    for current_page, parent in chunk:
+                        if self.budget_exhausted():
+                            return self.budget_exhausted_message()
+                        self.visited.add(current_page, parent)
+                        if parent != "":
+                            self.adjacency_list[parent].append(current_page)
+                        self.adjacency_list.setdefault(current_page, [])
+                        yield self.make_event(EXPANDED, current_page, parent)
+                        try:
+                            current_links = self.fetch_links(current_page)
+                            if current_links is None:
+                                continue
+                            # Meet if any link reaches a page already reached from the target
+                            for link in current_links:
+                                if title_key(link) in backward_reached:
+                                    backward_page, backward_parent = backward_reached[title_key(link)]
+                                    if backward_page not in self.backward_visited:
+                                        self.backward_visited.add(backward_page, backward_parent)
+                                    self.join_search_halves(current_page, backward_page)
+                                    return f"Target page '{target_title}' found starting from '{source_title}'"
+                            related_links = self.get_most_similar_links_to_target(current_page, current_links)
+                            # Print site and links for debugging
+                            if self.verbose: print(str(current_page) + " links to " + str(related_links))
+                            yield self.make_event(SCORED, current_page, candidates=related_links)
+                        except Exception as e:
+                            print(f"Failed to retrieve or process links for {current_page}: {e}")
+                            continue
+                        for page in related_links.keys():
+                            if title_key(page) not in forward_reached:
+                                forward_reached[title_key(page)] = (page, current_page)
+                                next_frontier.append((page, current_page))
+                forward_frontier = next_frontier
+            else:
+                next_frontier = []
+                for current_page, parent in backward_frontier:
+                    if self.budget_exhausted():
+                        return self.budget_exhausted_message()
+                    self.backward_visited.add(current_page, parent)
+                    self.adjacency_list.setdefault(current_page, [])
+                    if parent != "":
+                        self.adjacency_list[current_page].append(parent)
+                    yield self.make_event(EXPANDED, current_page, parent, backward=True)
+                    try:
+                        backlinks = self.fetch_backlinks(current_page)
+                        if backlinks is None:
+                            continue
+                        # Meet if any page linking here was already reached from the source
+                        for backlink in backlinks:
+                            if title_key(backlink) in forward_reached:
+                                forward_page, forward_parent = forward_reached[title_key(backlink)]
+                                if forward_page not in self.visited:
+                                    self.visited.add(forward_page, forward_parent)
+                                    self.adjacency_list[forward_parent].append(forward_page)
+                                self.join_search_halves(forward_page, current_page)
+                                return f"Target page '{target_title}' found starting from '{source_title}'"
+                        if source_profile is None:
+                            source_profile = self.get_source_profile()
+                        related_links = self.canonicalize_links(self.rank_titles(backlinks, source_profile,
+                                                                                 self.neighbors_to_check))
+                        # Print site and links for debugging
+                        if self.verbose: print(str(current_page) + " is linked from " + str(related_links))
+                        yield self.make_event(SCORED, current_page, candidates=related_links, backward=True)
+                    except Exception as e:
+                        print(f"Failed to retrieve or process backlinks for {current_page}: {e}")
+                        continue
+                    for page in related_links.keys():
+                        if title_key(page) not in backward_reached:
+                            backward_reached[title_key(page)] = (page, current_page)
+                            next_frontier.append((page, current_page))
+                backward_frontier = next_frontier
+
+        return "Target page not found within the connected pages."
+
+    # Exact search finds a true shortest path over the whole link graph, with no pruning. It runs on a CSRGraph page
+    # source: both directions expand whole levels at once with the visited sets held as boolean arrays, and only the
+    # pages of the path found enter the visited index and adjacency list
+    def exact_events(self):
+        self.reset_search_state()
+        if not isinstance(self.page_source, CSRGraph):
+            raise ValueError("Exact search needs a CSRGraph page source")
+        graph = self.page_source
+        source_id = graph.get_id(self.source_page_obj.title)
+        target_id = graph.get_id(self.target_page_obj.title)
+        if source_id is None or target_id is None:
+            return "Target page not found within the connected pages."
+
+        # Called before every level with the number of pages visited so far
+        def stop(pages_visited):
+            self.bitset_pages_visited = pages_visited
+            return self.budget_exhausted()
+
+        path_ids = shortest_path_ids(graph, source_id, target_id, stop)
+        if path_ids is None:
+            if self.stop_reason is not None:
+                return self.budget_exhausted_message()
+            return "Target page not found within the connected pages."
+
+        # Record the path, keeping the source and target titles as they were given
+        self.bitset_pages_visited -= len(path_ids)
+        current_page = self.source_page_obj.title
+        self.visited.add(current_page)
+        self.adjacency_list[current_page] = []
+        yield self.make_event(EXPANDED, current_page)
+        for page_id in path_ids[1:-1]:
+            page = graph.get_title(page_id)
+            self.visited.add(page, current_page)
+            self.adjacency_list[current_page].append(page)
+            self.adjacency_list[page] = []
+            yield self.make_event(EXPANDED, page, current_page)
+            current_page = page
+        if len(path_ids) == 1:
+            return f"Target page '{self.target_page_obj.title}' found starting from '{self.source_page_obj.title}'"
+        return self.reach_target(current_page)
+
+    # Stitches the two halves of a bidirectional search together: forward_page (reached from the source) links to
+    # backward_page (which leads to the target). The backward chain is added to the visited index with parents
+    # pointing towards the source, so trace_path_backwards sees one path
+    def join_search_halves(self, forward_page, backward_page) -> None:
+        self.adjacency_list.setdefault(forward_page, []).append(backward_page)
+        parent = forward_page
+        for page in self.backward_visited.path_to(backward_page)[::-1]:
+            if page != parent and page not in self.visited:
+                self.visited.add(page, parent)
+            self.adjacency_list.setdefault(page, [])
+            parent = page
+        self.target_page_obj.set_parent(self.visited.get(self.target_page_obj.title).parent)
+
+    # Each search method runs its event generator to the end and returns the message it finished with
+    def bfs_search(self):
+        return WikiApi.run_events(self.bfs_events())
+
+    def greedy_search(self):
+        return WikiApi.run_events(self.greedy_events())
+
+    def async_bfs_search(self):
+        return WikiApi.run_events(self.async_bfs_events())
+
+    def astar_search(self):
+        return WikiApi.run_events(self.astar_events())
+
+    def beam_search(self):
+        return WikiApi.run_events(self.beam_events())
+
+    def bidirectional_search(self):
+        return WikiApi.run_events(self.bidirectional_events())
+
+    def exact_search(self):
+        return WikiApi.run_events(self.exact_events())
+
+    # Drains an event generator and returns the value it returned
+    @staticmethod
+    def run_events(events):
+        while True:
+            try:
+                next(events)
+            except StopIteration as stop:
+                return stop.value
+
+    # Returns the event generator of the search algorithm chosen by the search mode
+    def search_events(self):
+        mode = self.get_search_mode()
+        if mode == "exact":
+            return self.exact_events()
+        elif mode == "beam":
+            return self.beam_events()
+        elif mode == "astar":
+            return self.astar_events()
+        elif mode == "bidirectional":
+            return self.bidirectional_events()
+        elif mode == "async_bfs":
+            return self.async_bfs_events()
+        elif mode == "bfs":
+            return self.bfs_events()
+        return self.greedy_events()
+
+    # Runs the search algorithm chosen by the search mode, yielding a SearchEvent as each page is expanded and scored,
+    # counters every STATS_INTERVAL pages, FOUND with the path once the target is reached and FINISHED with the
+    # SearchResult last. Closing the generator stops the search. deadline (seconds of wall time), max_pages (pages
+    # visited) and max_requests (page source requests) bound the work; when one runs out the search stops cleanly
+    # and the result holds the chain to the most promising page reached so far, flagged as partial
+    def iter_search(self, deadline: Optional[float] = None, max_pages: Optional[int] = None,
+                    max_requests: Optional[int] = None):
+        self.budget = SearchBudget(deadline, max_pages, max_requests)
+        events = self.search_events()
+        try:
+            expanded = 0
+            while True:
+                try:
+                    event = next(events)
+                except StopIteration as stop:
+                    message = stop.value
+                    break
+                yield event
+                if event.kind == EXPANDED:
+                    expanded += 1
+                    if expanded % WikiApi.STATS_INTERVAL == 0:
+                        yield self.make_event(STATS)
+            result = self.build_search_result(message)
+            if result.found:
+                yield self.make_event(FOUND, self.target_page_obj.title, path=result.path)
+            yield self.make_event(FINISHED, result=result)
+        finally:
+            events.close()
+            self.budget = SearchBudget()
+
+    # Runs the search algorithm chosen by the search mode to the end and returns its SearchResult, see iter_search
+    def search(self, deadline: Optional[float] = None, max_pages: Optional[int] = None,
+               max_requests: Optional[int] = None) -> SearchResult:
+        for event in self.iter_search(deadline, max_pages, max_requests):
+            if event.kind == FINISHED:
+                return event.result
+
+    # Builds an event about a page, with the counters of the running search filled in
+    def make_event(self, kind, page="", parent="", candidates=None, backward=False, path=None,
+                   result=None) -> SearchEvent:
+        record = (self.backward_visited if backward else self.visited).get(page) if page else None
+        return SearchEvent(kind, page, parent, record.depth if record is not None else 0, backward, candidates, path,
+                           len(self.visited) + len(self.backward_visited) + self.bitset_pages_visited,
+                           self.requests_issued,
+                           self.budget.elapsed(), result)
+
+    # Packs the outcome of the last search into a SearchResult
+    def build_search_result(self, message) -> SearchResult:
+        path = self.trace_path_backwards()
+        score = None
+        # Without the target, fall back on the chain to the best scored page seen
+        if path is None and self.best_candidate is not None:
+            score, page, parent = self.best_candidate
+            path = self.visited.path_to(page) or self.visited.path_to(parent) + [page]
+        return SearchResult(found=self.target_page_obj.title in self.visited, path=path,
+                            partial=self.target_page_obj.title not in self.visited, message=message,
+                            stop_reason=self.stop_reason, pages_visited=self.get_number_of_visited_sites(),
+                            requests_issued=self.requests_issued, elapsed=self.budget.elapsed(), score=score)
 
     # Get title of source page
     def get_source_page_title(self) -> str:
@@ -336,6 +1174,14 @@ class WikiApi:
     def get_target_page_title(self) -> str:
         return self.target_page_obj.title
 
+
+# Finds a path between two pages in one call and returns the SearchResult. Keyword arguments are those of WikiApi
+# (search_mode, neighbors_checked, page_source, ...), debug printing is off unless verbose=True is passed
+def find_path(source, target, deadline: Optional[float] = None, max_pages: Optional[int] = None,
+              max_requests: Optional[int] = None, **options) -> SearchResult:
+    options.setdefault("verbose", False)
+    return WikiApi(source, target, **options).search(deadline, max_pages, max_requests)
+
 if __name__ == '__main__':
     wikiInstance = WikiApi("Starbucks", "Strawberry")
     # Yields path of length 4 in about 20 seconds
@@ -0,0 +1 @@
+# Benchmarks for the search code, run from the repository root with e.g. `python -m benchmarks.visited_index`
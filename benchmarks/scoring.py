@@ -0,0 +1,91 @@
+# Measures link scoring throughput in titles per second: the original loop, which calls wordfreq and builds a
+# lambda for every matching word, against scoring with a weight table built once per target, and against the
+# vectorized scorer that also selects the top N without sorting every score
+import math
+import random
+import sys
+import time
+import wordfreq
+from Wikibot.wikiapi.scoring import STOP_WORDS, WeightVocabulary, build_weight_table, score_title, top_titles_vectorized
+
+
+# Scoring loop as it was before the weight table
+def legacy_scores(titles, target_words, stop_words, adjust_for_word_uniqueness=True):
+    scores = {}
+    for title in titles:
+        words = [word for word in title.upper().split() if word not in stop_words]
+        total_freq = 0
+        for word in words:
+            if word in target_words.keys():
+                word_uniqueness = wordfreq.word_frequency(word, "en")
+                if word_uniqueness <= 0: word_uniqueness_weight = lambda word: 10
+                else: word_uniqueness_weight = lambda word: -1 * math.log10(word_uniqueness) - 1
+                if not adjust_for_word_uniqueness: word_uniqueness_weight = lambda word: 1
+                total_freq += target_words[word] * word_uniqueness_weight(word)
+        try:
+            total_freq /= len(words)
+        except ZeroDivisionError:
+            total_freq = 0
+        scores[title] = total_freq
+    return scores
+
+
+def table_scores(titles, weights, stop_words):
+    return {title: score_title(title, weights, stop_words) for title in titles}
+
+
+# Scores each page and keeps its n best links, the way get_most_similar_links_to_target does
+def python_top_n(pages, weights, stop_words, n):
+    results = []
+    for titles in pages:
+        scores = table_scores(titles, weights, stop_words)
+        scores = dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
+        results.append([(title, scores[title]) for title in list(scores)[:n]])
+    return results
+
+
+def vectorized_top_n(pages, vocabulary, stop_words, n):
+    return [top_titles_vectorized(titles, vocabulary, stop_words, n) for titles in pages]
+
+
+def make_workload(title_count, seed=0):
+    rng = random.Random(seed)
+    vocabulary = [word.upper() for word in wordfreq.top_n_list("en", 20000) if word.isalpha()]
+    target_words = {word: rng.randint(1, 50) for word in rng.sample(vocabulary[:8000], 3000)}
+    titles = [" ".join(rng.choice(vocabulary).title() for _ in range(rng.randint(1, 4))) for _ in range(title_count)]
+    return titles, target_words
+
+
+if __name__ == '__main__':
+    title_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    titles, target_words = make_workload(title_count)
+    stop_words = set(STOP_WORDS)
+
+    start = time.perf_counter()
+    legacy = legacy_scores(titles, target_words, stop_words)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    weights = build_weight_table(target_words)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    table = table_scores(titles, weights, stop_words)
+    table_time = time.perf_counter() - start
+
+    assert all(math.isclose(legacy[title], table[title]) for title in titles)
+    print(f"legacy loop:  {title_count / legacy_time:12,.0f} titles/s")
+    print(f"weight table: {title_count / table_time:12,.0f} titles/s "
+          f"(table of {len(weights)} words built once in {build_time * 1000:.1f} ms)")
+
+    # Top 5 of pages with 2000 links each, like lists and countries
+    pages = [list(dict.fromkeys(titles[start:start + 2000])) for start in range(0, title_count, 2000)]
+    vocabulary = WeightVocabulary(weights)
+    start = time.perf_counter()
+    expected = python_top_n(pages, weights, stop_words, 5)
+    python_time = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = vectorized_top_n(pages, vocabulary, stop_words, 5)
+    vectorized_time = time.perf_counter() - start
+    assert [[title for title, _ in page] for page in expected] == [[title for title, _ in page] for page in actual]
+    print(f"top 5 of 2000 links, score + sort: {title_count / python_time:12,.0f} titles/s")
+    print(f"top 5 of 2000 links, vectorized:   {title_count / vectorized_time:12,.0f} titles/s")
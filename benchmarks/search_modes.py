@@ -0,0 +1,118 @@
+# Runs every search mode over a fixed set of queries on a synthetic graph and reports pages visited, page source
+# requests, path length, wall time and peak memory, so changes to the search code show up as numbers:
+#   python -m benchmarks.search_modes [--pages 5000] [--queries 20] [--modes greedy bfs] [--latency 0.002] [--json]
+#                                     [--frontier-capacity 1000] [--scorers relation bm25] [--redirects 0.3]
+# Each query starts cold (fresh page cache and profile cache); peak memory is measured in a second, traced pass so
+# tracing does not slow down the timed one. The exact mode runs on a CSR graph built from the same links, and the
+# BM25 scorer uses document frequencies counted over the synthetic texts. With --redirects a share of the pages get a
+# redirect alias that links may go through, so searches have titles to resolve
+import argparse
+import contextlib
+import io
+import json
+import tempfile
+import time
+import tracemalloc
+from Wikibot.wikiapi.csrgraph import build_csr_graph
+from Wikibot.wikiapi.pagecache import PageCache
+from Wikibot.wikiapi.pagesource import PageSource
+from Wikibot.wikiapi.scorers import BM25Scorer, RelationScorer, build_document_frequencies
+from Wikibot.wikiapi.targetprofile import TargetProfileCache
+from Wikibot.wikiapi.wikiAPI_functions import WikiApi
+from benchmarks.synthetic import CountingPageSource, add_redirects, generate_graph, generate_queries
+
+
+# Runs one query cold and returns (result, requests, seconds)
+def run_query(source: PageSource, mode, source_title, target_title, options):
+    # A CSR graph is read from disk and makes no requests
+    requests_before = getattr(source, "requests", 0)
+    start = time.perf_counter()
+    wiki = WikiApi(source_title, target_title, page_source=source, page_cache=PageCache(),
+                   profile_cache=TargetProfileCache(), search_mode=mode, verbose=False, **options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = wiki.search()
+    return result, getattr(source, "requests", 0) - requests_before, time.perf_counter() - start
+
+
+# Returns the summary of one mode over every query
+def benchmark_mode(source: PageSource, mode, queries, options) -> dict:
+    scorer = options.get("scorer")
+    found = pages = requests = path_length = 0
+    seconds = 0.0
+    for source_title, target_title in queries:
+        result, query_requests, query_seconds = run_query(source, mode, source_title, target_title, options)
+        found += result.found
+        pages += result.pages_visited
+        requests += query_requests
+        seconds += query_seconds
+        if result.found:
+            path_length += len(result.path) - 1
+    peak = 0
+    for source_title, target_title in queries:
+        tracemalloc.start()
+        run_query(source, mode, source_title, target_title, options)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {"mode": mode, "scorer": scorer.name if scorer is not None else "relation", "queries": len(queries),
+            "found": found,
+            "pages_per_query": pages / len(queries), "requests_per_query": requests / len(queries),
+            "mean_path_length": path_length / found if found else None,
+            "ms_per_query": seconds * 1000 / len(queries), "peak_kib": peak / 1024}
+
+
+def print_table(rows) -> None:
+    print(f"{'mode':<14}{'scorer':<10}{'found':>8}{'pages/q':>10}{'requests/q':>12}{'path len':>10}{'ms/q':>10}{'peak KiB':>11}")
+    for row in rows:
+        path_length = f"{row['mean_path_length']:.2f}" if row["mean_path_length"] is not None else "-"
+        print(f"{row['mode']:<14}{row['scorer']:<10}{row['found']:>4}/{row['queries']:<3}{row['pages_per_query']:>10.1f}"
+              f"{row['requests_per_query']:>12.1f}{path_length:>10}{row['ms_per_query']:>10.1f}{row['peak_kib']:>11.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the search modes on a synthetic link graph")
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--modes", nargs="+", choices=WikiApi.SEARCH_MODES, default=list(WikiApi.SEARCH_MODES))
+    parser.add_argument("--breadth", type=int, default=5, help="best links kept from each page")
+    parser.add_argument("--frontier-capacity", type=int, help="pages BFS and greedy search may keep queued")
+    parser.add_argument("--scorers", nargs="+", choices=("relation", "bm25"), default=["relation"],
+                        help="link scorers to run every mode with")
+    parser.add_argument("--redirects", type=float, default=0.0, help="share of pages with a redirect alias")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds each page source request sleeps")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per mode instead of a table")
+    args = parser.parse_args()
+
+    links, texts = generate_graph(args.pages, args.seed)
+    redirects = None
+    if args.redirects:
+        links, redirects = add_redirects(links, args.redirects, args.seed + 2)
+    page_source = CountingPageSource(links, texts, name=f"synthetic-{args.pages}-{args.seed}-{args.redirects}",
+                                     latency=args.latency, redirects=redirects)
+    queries = generate_queries(list(links), args.queries, args.seed + 1)
+    scorers = {"relation": RelationScorer()}
+    if "bm25" in args.scorers:
+        scorers["bm25"] = BM25Scorer(build_document_frequencies(texts.items()))
+    with tempfile.TemporaryDirectory() as graph_directory:
+        # The graph has no redirects, its links go straight to the pages aliases lead to
+        graph_links = links
+        if redirects:
+            graph_links = {page: [redirects.get(link, link) for link in page_links]
+                           for page, page_links in links.items()}
+        graph = build_csr_graph(graph_directory, graph_links.items()) if "exact" in args.modes else None
+        # Exact search ranks no links, so it runs once whatever the scorers
+        runs = [(mode, scorer_name) for mode in args.modes
+                for scorer_name in (args.scorers if mode != "exact" else args.scorers[:1])]
+        rows = [benchmark_mode(graph if mode == "exact" else page_source, mode, queries,
+                               {"neighbors_checked": args.breadth, "frontier_capacity": args.frontier_capacity,
+                                "scorer": scorers[scorer_name]})
+                for mode, scorer_name in runs]
+        # Memory maps have to be closed before the directory can go on every platform
+        del graph
+    if args.json:
+        for row in rows:
+            print(json.dumps(row))
+    else:
+        print(f"{args.pages} pages, {sum(len(page_links) for page_links in links.values())} links, "
+              f"{args.queries} queries")
+        print_table(rows)
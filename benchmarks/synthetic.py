@@ -0,0 +1,143 @@
+# Synthetic Wikipedia-like link graphs for reproducible search benchmarks. Pages belong to topics; a page's title and
+# text are drawn from its topic's words, and its links go mostly to pages of the same topic, picked with a power law
+# so a few pages are linked from everywhere like on Wikipedia. Relation scores therefore carry the same kind of signal
+# greedy search relies on, and every run with the same seed produces the same graph
+import math
+import threading
+import time
+from typing import Optional
+import numpy as np
+from Wikibot.wikiapi.pagesource import MAX_TITLES_PER_QUERY, DictPageSource
+
+_syllables = ["ka", "lo", "mi", "ren", "tor", "vel", "sa", "dun", "pri", "gal", "mo", "zen", "ti", "bra", "hol",
+              "quin", "fer", "no", "lux", "ar", "ce", "dro", "is", "ven"]
+
+
+# Returns count distinct pronounceable made-up words
+def make_words(count, rng: np.random.Generator) -> list[str]:
+    words = []
+    seen = set()
+    while len(words) < count:
+        word = "".join(rng.choice(_syllables, size=rng.integers(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word.capitalize())
+    return words
+
+
+# Returns (links, texts) of a graph of page_count pages. Out degrees and link popularity follow power laws with
+# mean_links links per page on average; locality is the share of links that stay within the page's topic
+def generate_graph(page_count=5000, seed=7, topics=50, words_per_topic=40, mean_links=40, popularity_exponent=1.1,
+                   locality=0.8, text_tokens=300) -> tuple[dict[str, list[str]], dict[str, str]]:
+    rng = np.random.default_rng(seed)
+    vocabulary = make_words(topics * words_per_topic, rng)
+    topic_words = [vocabulary[topic * words_per_topic:(topic + 1) * words_per_topic] for topic in range(topics)]
+    # Zipf weights over a topic's words, shared by titles and text
+    word_weights = 1 / np.arange(1, words_per_topic + 1) ** 1.0
+    word_weights /= word_weights.sum()
+
+    page_topics = rng.integers(0, topics, size=page_count)
+    titles = []
+    for page, topic in enumerate(page_topics):
+        words = rng.choice(topic_words[topic], size=2, replace=False, p=word_weights)
+        titles.append(f"{words[0]} {words[1].lower()} {page}")
+
+    # Popularity of every page, a random permutation so popular pages are spread over topics
+    popularity = 1 / rng.permutation(np.arange(1, page_count + 1)) ** popularity_exponent
+    pages_of_topic = [np.flatnonzero(page_topics == topic) for topic in range(topics)]
+    topic_popularity = [popularity[pages] / popularity[pages].sum() for pages in pages_of_topic]
+    global_popularity = popularity / popularity.sum()
+
+    # Out degrees from a Pareto distribution scaled to the requested mean, at least one link each
+    shape = 2.0
+    degrees = np.maximum(1, (rng.pareto(shape, size=page_count) + 1) * mean_links * (shape - 1) / shape).astype(int)
+    degrees = np.minimum(degrees, page_count - 1)
+
+    links = {}
+    texts = {}
+    for page in range(page_count):
+        topic = page_topics[page]
+        local_count = int(round(degrees[page] * locality)) if len(pages_of_topic[topic]) > 1 else 0
+        local = rng.choice(pages_of_topic[topic], size=min(local_count, len(pages_of_topic[topic])), replace=False,
+                           p=topic_popularity[topic])
+        remote = rng.choice(page_count, size=degrees[page] - len(local), p=global_popularity)
+        targets = dict.fromkeys(int(target) for target in np.concatenate((local, remote)) if target != page)
+        links[titles[page]] = [titles[target] for target in targets]
+        # Text mixes topic words with the titles of linked pages, like an article mentioning what it links to
+        words = list(rng.choice(topic_words[topic], size=text_tokens, p=word_weights))
+        for target in list(targets)[:text_tokens // 10]:
+            words.extend(titles[target].split()[:2])
+        texts[titles[page]] = " ".join(words)
+    return links, texts
+
+
+# Returns query_count (source, target) pairs of distinct pages, the same for the same seed
+def generate_queries(titles: list[str], query_count=20, seed=11) -> list[tuple[str, str]]:
+    rng = np.random.default_rng(seed)
+    queries = []
+    for _ in range(query_count):
+        source, target = rng.choice(len(titles), size=2, replace=False)
+        queries.append((titles[source], titles[target]))
+    return queries
+
+
+# Returns (links, redirects) with a redirect alias for a fraction of the pages, and about half the links to those pages
+# going through the alias instead, like Wikipedia links to "UK" that lead to "United Kingdom". An alias has the same
+# words as its page in another order, so it scores the same
+def add_redirects(links: dict[str, list[str]], fraction=0.3,
+                  seed=13) -> tuple[dict[str, list[str]], dict[str, str]]:
+    rng = np.random.default_rng(seed)
+    titles = list(links)
+    aliased = rng.choice(len(titles), size=int(len(titles) * fraction), replace=False)
+    aliases = {}
+    for page in aliased:
+        first, second, number = titles[page].split()
+        aliases[titles[page]] = f"{second.capitalize()} {first.lower()} {number}"
+    redirected_links = {}
+    for page_title, page_links in links.items():
+        through_alias = rng.random(len(page_links)) < 0.5
+        redirected_links[page_title] = [aliases[link] if link in aliases and alias else link
+                                        for link, alias in zip(page_links, through_alias)]
+    return redirected_links, {alias: page_title for page_title, alias in aliases.items()}
+
+
+# In-memory page source that counts the requests a network source would have made, optionally sleeping for each
+# one to imitate network latency
+class CountingPageSource(DictPageSource):
+    def __init__(self, links: dict[str, list[str]], texts: Optional[dict[str, str]] = None, name="synthetic",
+                 latency=0.0, redirects: Optional[dict[str, str]] = None):
+        super().__init__(links, texts, name, redirects)
+        self.latency = latency
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def count_request(self, count=1) -> None:
+        with self.lock:
+            self.requests += count
+        if self.latency:
+            time.sleep(self.latency * count)
+
+    def get_links(self, page_title) -> Optional[list[str]]:
+        self.count_request()
+        return super().get_links(page_title)
+
+    def get_text(self, page_title) -> Optional[str]:
+        self.count_request()
+        return super().get_text(page_title)
+
+    def get_backlinks(self, page_title) -> Optional[list[str]]:
+        self.count_request()
+        return super().get_backlinks(page_title)
+
+    def get_redirects(self, page_title) -> list[str]:
+        self.count_request()
+        return super().get_redirects(page_title)
+
+    # One request per MAX_TITLES_PER_QUERY titles, like the batched Wikipedia queries
+    def resolve_titles(self, page_titles: list[str]) -> dict[str, Optional[str]]:
+        self.count_request(math.ceil(len(page_titles) / MAX_TITLES_PER_QUERY))
+        return super().resolve_titles(page_titles)
+
+    def get_links_many(self, page_titles: list[str]) -> dict[str, Optional[list[str]]]:
+        self.count_request(math.ceil(len(page_titles) / MAX_TITLES_PER_QUERY))
+        return {page_title: DictPageSource.get_links(self, page_title) for page_title in page_titles}
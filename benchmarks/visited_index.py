@@ -0,0 +1,68 @@
+# Measures visited page bookkeeping on searches that visit 10k+ pages. Compares the title indexed VisitedIndex with
+# the linear scan over every visited page that searches used to do for each lookup
+import contextlib
+import io
+import sys
+import time
+from Wikibot.wikiapi.pagecache import PageCache
+from Wikibot.wikiapi.pagesource import DictPageSource
+from Wikibot.wikiapi.visited import VisitedIndex
+from Wikibot.wikiapi.wikiAPI_functions import WikiApi
+
+
+# Builds a binary tree of numbered pages whose last leaf is the target, so BFS has to visit every page
+def build_tree(page_count):
+    links = {f"Node {i}": [f"Node {2 * i + 1}", f"Node {2 * i + 2}"] for i in range(page_count)}
+    return DictPageSource(links, {f"Node {page_count - 1}": "leaf"}, name="benchmark-tree")
+
+
+# Old behaviour: scan every visited record for the matching title
+def linear_lookup(records, page_title):
+    for record in records:
+        if record.title == page_title: return record
+    return None
+
+
+def time_lookups(page_count, lookups):
+    index = VisitedIndex()
+    index.add("Node 0")
+    for i in range(1, page_count):
+        index.add(f"Node {i}", f"Node {(i - 1) // 2}")
+    records = [index.get(title) for title in index]
+    titles = [f"Node {i * page_count // lookups}" for i in range(lookups)]
+
+    start = time.perf_counter()
+    for title in titles:
+        linear_lookup(records, title)
+    linear_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for title in titles:
+        index.get(title)
+    indexed_time = time.perf_counter() - start
+    return linear_time, indexed_time
+
+
+def time_search(page_count):
+    source = build_tree(page_count)
+    wiki = WikiApi("Node 0", f"Node {page_count - 1}", False, 2, True, page_source=source,
+                   page_cache=PageCache(memory_entries=0))
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        wiki.bfs_search()
+    search_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    path = wiki.trace_path_backwards()
+    trace_time = time.perf_counter() - start
+    return wiki.get_number_of_visited_sites(), len(path) - 1, search_time, trace_time
+
+
+if __name__ == '__main__':
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    linear_time, indexed_time = time_lookups(page_count, 2000)
+    print(f"2000 lookups over {page_count} visited pages: linear scan {linear_time * 1000:.1f} ms, "
+          f"index {indexed_time * 1000:.3f} ms ({linear_time / indexed_time:.0f}x)")
+    visited, length, search_time, trace_time = time_search(page_count)
+    print(f"BFS over a {page_count} page tree: {visited} pages visited in {search_time:.2f} s, "
+          f"path of length {length} traced in {trace_time * 1000:.3f} ms")